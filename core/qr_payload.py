@@ -0,0 +1,62 @@
+import json
+import zlib
+from collections import namedtuple
+
+# 출석부 QR payload 형식
+# v1 (compact): "QA1:<学籍番号>:<교수 코드>" - 영문 대문자/숫자/':' 만 사용해 QR 영숫자 모드로 인코딩되므로 버전(모듈 수)이 작음
+# legacy: json.dumps({"担当教員名": ..., "学籍番号": ...}) - 이전에 배포된 QR 도 계속 읽을 수 있도록 지원
+COMPACT_PREFIX = "QA1:"
+COMPACT = "compact"
+LEGACY_JSON = "json"
+PAYLOAD_FORMATS = (COMPACT, LEGACY_JSON)
+
+QRPayload = namedtuple("QRPayload", "version student_id teacher_code")
+
+_compact_prefix = COMPACT_PREFIX.encode("ascii")
+_json_decoder = json.decoder.JSONDecoder()
+
+
+def teacher_code(teacher_name) -> str:
+    # 담당교수명 -> 4자리 16진수 코드 (같은 이름이면 항상 같은 코드)
+    return f"{zlib.crc32(str(teacher_name).strip().encode('utf-8')) & 0xFFFF:04X}"
+
+
+def encode_payload(student_id, teacher_name=None, payload_format=COMPACT) -> str:
+    if payload_format == LEGACY_JSON:
+        qr_code_data = {
+            "担当教員名": teacher_name, # 담당교수명
+            "学籍番号": student_id, # 학번
+        }
+        return json.dumps(qr_code_data)
+    if payload_format != COMPACT:
+        raise ValueError(f"unknown payload format: {payload_format}")
+    code = teacher_code(teacher_name) if teacher_name is not None else ""
+    return f"{COMPACT_PREFIX}{str(student_id).strip()}:{code}"
+
+
+def is_compact(payload) -> bool:
+    if isinstance(payload, bytes):
+        return payload.startswith(_compact_prefix)
+    return payload.startswith(COMPACT_PREFIX)
+
+
+def decode_payload(payload: bytes):
+    # QR payload -> QRPayload, 형식이 맞지 않으면 None
+    # compact 형식은 문자열 분리만으로 처리 (JSON 파싱 없음)
+    if payload.startswith(_compact_prefix):
+        try:
+            body = payload[len(_compact_prefix):].decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+        student_id, _, code = body.rpartition(":")
+        if not student_id:
+            return None
+        return QRPayload(1, student_id, code or None)
+    # 이전 형식 (ASCII 이스케이프된 JSON)
+    try:
+        info = _json_decoder.decode(payload.decode("unicode_escape"))
+        student_id = info["学籍番号"]
+    except (ValueError, KeyError, TypeError):
+        return None
+    teacher_name = info.get("担当教員名")
+    return QRPayload(0, student_id, teacher_code(teacher_name) if teacher_name is not None else None)
@@ -0,0 +1,155 @@
+import argparse
+import multiprocessing
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import cv2
+import pandas as pd
+
+from core.qr_reader.checkin import CheckInEngine, parse_student_id, CHECKED_IN, ALREADY_CHECKED, NOT_FOUND
+from core.qr_reader.decode_preprocess import RegionDecoder
+from core.qr_reader.decoders import DEFAULT_DECODER, DECODERS, create_decoder
+from core.qr_reader.frame_sources import is_image_dir, list_images, read_image
+from core.qr_reader.roster import AttendanceRoster
+from core.qr_reader.scan_journal import ScanJournal, compact_journal
+
+# 화면(카메라) 없이 녹화된 출입구 영상 또는 QR 사진 폴더에서 출석을 일괄 처리
+# 사용 예: python core/qr_reader/batch_scan.py 출석부_SEPERATE.xlsx クラス名 entrance.mp4 photos/ --workers 4
+
+# 작업 프로세스마다 한 번만 생성하는 디코더
+_decoder = None
+
+
+def _init_worker(decoder_name):
+    global _decoder
+    _decoder = RegionDecoder(create_decoder(decoder_name))
+
+
+def _decode_frame(frame):
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return [barcode.data for barcode in _decoder.decode(gray)]
+
+
+def _decode_image(path):
+    # 사진 1장 디코딩 -> payload 목록
+    frame = read_image(path)
+    if frame is None:
+        return path, []
+    return path, _decode_frame(frame)
+
+
+def _decode_video_range(args):
+    # 영상의 [start, stop) 구간을 step 간격으로 디코딩 (프레임을 프로세스 간에 복사하지 않도록 각 프로세스가 직접 읽음)
+    path, start, stop, step = args
+    capture = cv2.VideoCapture(path)
+    capture.set(cv2.CAP_PROP_POS_FRAMES, start)
+    payloads = []
+    try:
+        for index in range(start, stop):
+            if (index - start) % step:
+                if not capture.grab():
+                    break
+                continue
+            ret, frame = capture.read()
+            if not ret:
+                break
+            payloads.extend(_decode_frame(frame))
+    finally:
+        capture.release()
+    return f"{path} [{start}-{stop})", payloads
+
+
+def video_tasks(path, workers, step):
+    # 영상을 작업 프로세스 수에 맞춰 구간으로 분할
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise IOError(f"cannot open video: {path}")
+    frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    capture.release()
+    if frame_count <= 0:
+        # 프레임 수를 알 수 없는 영상은 한 프로세스에서 끝까지 읽음
+        return [(path, 0, sys.maxsize, step)]
+    chunk = max(step, -(-frame_count // (workers * 4)))
+    chunk -= chunk % step
+    return [(path, start, min(start + chunk, frame_count), step) for start in range(0, frame_count, chunk)]
+
+
+def scan_sources(sources, decoder_name=DEFAULT_DECODER, workers=None, step=1):
+    # 모든 입력을 프로세스 풀로 디코딩하고, 처음 읽힌 순서대로 중복 없는 payload 목록 반환
+    workers = workers or os.cpu_count() or 1
+    payloads = {}
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(decoder_name,)) as pool:
+        for source in sources:
+            if is_image_dir(source):
+                results = pool.imap(_decode_image, list_images(source), chunksize=8)
+            else:
+                results = pool.imap(_decode_video_range, video_tasks(source, workers, step))
+            for name, found in results:
+                for payload in found:
+                    payloads.setdefault(payload, name)
+    return payloads
+
+
+def apply_check_ins(file_path, sheet_name, payloads):
+    # 디코딩된 payload 로 출석 처리 후 엑셀 파일에 한 번만 저장
+    journal = ScanJournal(file_path)
+    if journal.has_entries():
+        # 이전 실행에서 반영되지 못한 저널을 먼저 반영
+        compact_journal(file_path, journal)
+
+    df_sheet = pd.read_excel(file_path, sheet_name=sheet_name)
+    engine = CheckInEngine(AttendanceRoster(df_sheet), sheet_name=sheet_name)
+    results = {CHECKED_IN: [], ALREADY_CHECKED: [], NOT_FOUND: []}
+    invalid = []
+    checked_ids = set()
+    for payload, name in payloads.items():
+        student_id = parse_student_id(payload)
+        if not student_id:
+            invalid.append(name)
+            continue
+        if student_id in checked_ids:
+            continue
+        checked_ids.add(student_id)
+        result = engine.check_in(student_id, source=name)
+        results[result.status].append(result)
+
+    if engine.changed:
+        compact_journal(file_path, journal, {sheet_name: df_sheet})
+    return results, invalid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch QR attendance scanner (video files / image folders)")
+    parser.add_argument("file_path", help="SEPERATE workbook (.xlsx)")
+    parser.add_argument("sheet", help="class sheet name")
+    parser.add_argument("sources", nargs="+", help="video files or image folders")
+    parser.add_argument("--decoder", default=DEFAULT_DECODER, choices=list(DECODERS))
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--step", type=int, default=1, help="decode every N-th video frame")
+    args = parser.parse_args(argv)
+
+    sheet_names = pd.ExcelFile(args.file_path).sheet_names
+    if args.sheet not in sheet_names:
+        print(f"sheet not found: {args.sheet}")
+        return 1
+
+    payloads = scan_sources(args.sources, args.decoder, args.workers, max(1, args.step))
+    results, invalid = apply_check_ins(args.file_path, args.sheet, payloads)
+
+    print(f"QR codes found: {len(payloads)}")
+    print(f"Attendance recorded: {len(results[CHECKED_IN])}")
+    for result in results[CHECKED_IN]:
+        print(f"  {result.student_id}, {result.name} ({result.source})")
+    print(f"Already checked: {len(results[ALREADY_CHECKED])}")
+    if results[NOT_FOUND]:
+        print(f"Not existed in attendance list: {', '.join(str(r.student_id) for r in results[NOT_FOUND])}")
+    if invalid:
+        print(f"Unreadable QR payloads: {len(invalid)}")
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,220 @@
+import os
+import time
+
+import cv2
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+from core.qr_reader.decode_worker import FrameCounters
+from core.qr_reader.frame_buffer import FrameRing, DROP_OLDEST
+from core.qr_reader.stage_timing import CAMERA_READ, FLIP
+
+
+def is_file_source(source):
+    # 영상 파일 (카메라 번호/스트림 주소가 아닌 경우) - 실제 속도보다 빨리 읽힘
+    return isinstance(source, str) and os.path.isfile(source)
+
+
+def is_device_source(source):
+    # 카메라 장치 번호 - 화면을 닫아도 열어둘 수 있는 것은 장치뿐 (영상 파일/스트림은 열어두면 그동안 소비됨)
+    return isinstance(source, int)
+
+
+# 락 상태 해결을 위해 스레드 사용
+class CameraThread(QThread):
+    # 프레임 준비 시그널(프레임은 링버퍼로 전달), 카메라 준비 시그널
+    frameReady = pyqtSignal()
+    cameraReady = pyqtSignal()
+    # 장치 열기 재시도 간격(ms), 최대 간격(ms)
+    open_retry_interval = 200
+    open_retry_max_interval = 2000
+    # 화면이 연결되지 않은 동안 장치 버퍼를 비우는 속도 (target_fps 가 없을 때)
+    idle_fps = 15
+
+    def __init__(self, frame_ring, source=0, target_fps=15, counters=None, timer=None, parent=None):
+        super().__init__(parent)
+        self.timer = timer # 단계별 처리 시간 측정 (StageTimer)
+        self.capture = None
+        self.running = False
+        self.ready = False # 장치가 열리고 링버퍼가 할당됨
+        self.active = True # False 이면 연결된 화면이 없으므로 grab 만 하고 프레임은 넘기지 않음
+        self.frame_ring = frame_ring
+        self.source = source # 카메라 번호 또는 영상 경로
+        self.target_fps = target_fps # 0 이하이면 카메라 속도 그대로 사용
+        self.counters = counters if counters is not None else FrameCounters()
+
+    def open_capture(self):
+        # 장치가 열릴 때까지 간격을 늘려가며 재시도 (종료 요청 시 바로 중단)
+        interval = self.open_retry_interval
+        reported = False # 카메라가 없는 PC 에서 계속 출력되지 않도록 첫 실패만 알림
+        while self.running:
+            capture = cv2.VideoCapture(self.source)  # 카메라 장치 열기
+            if capture.isOpened():
+                return capture
+            capture.release()
+            if not reported:
+                print(f"Camera {self.source} is not available, retrying in the background")
+                reported = True
+            self.msleep(interval)
+            interval = min(interval * 2, self.open_retry_max_interval)
+        return None
+
+    def start(self):
+        # 종료 요청(stop)이 run 시작보다 먼저 와도 놓치지 않도록 시작 전에 설정
+        self.running = True
+        super().start()
+
+    def run(self):
+        self.capture = self.open_capture()
+        if self.capture is None:
+            return
+
+        # 첫 프레임 크기로 링버퍼 미리 할당
+        raw = None
+        while self.running and raw is None:
+            ret, raw = self.capture.read()
+            if not ret:
+                raw = None
+                self.msleep(10)
+        if raw is not None and not self.frame_ring.allocated:
+            self.frame_ring.allocate(raw.shape, raw.dtype)
+
+        # 카메라 준비완료 시그널
+        self.ready = raw is not None
+        self.cameraReady.emit()
+
+        interval = 1.0 / self.target_fps if self.target_fps and self.target_fps > 0 else 0
+        file_source = is_file_source(self.source)
+        if file_source and not interval:
+            # 속도 지정이 없으면 영상 파일의 원래 속도로 재생
+            file_fps = self.capture.get(cv2.CAP_PROP_FPS)
+            interval = 1.0 / file_fps if file_fps and file_fps > 0 else 0
+        idle_interval = interval or 1.0 / self.idle_fps
+        next_time = time.monotonic()
+        while self.running:
+            if file_source or not self.active:
+                # 영상 파일은 프레임을 버리지 않고, 화면이 연결되지 않은 동안은 CPU 를 쓰지 않도록 다음 프레임 시각까지 대기
+                delay = next_time - time.monotonic()
+                if delay > 0:
+                    self.msleep(int(delay * 1000))
+            # grab 은 카메라 버퍼만 비우고 디코딩하지 않음 -> 필요 없는 프레임은 retrieve 하지 않아 CPU 절약
+            read_start = time.perf_counter()
+            if not self.capture.grab():
+                if file_source:
+                    # 영상 끝 - 스레드 종료 (다시 연결하면 처음부터 다시 열림)
+                    break
+                self.msleep(10)
+                continue
+            now = time.monotonic()
+            if not self.active:
+                # 화면이 연결되지 않은 동안에는 장치를 열어둔 채 target_fps 간격으로 오래된 프레임만 비움
+                next_time = max(next_time + idle_interval, now)
+                continue
+            if now < next_time and not file_source:
+                # 카메라 장치/스트림은 실시간이므로 필요 없는 프레임은 버림 (장치 버퍼에 오래된 프레임이 쌓이지 않음)
+                continue
+            next_time = max(next_time + interval, now)
+            ret, raw = self.capture.retrieve(raw)
+            if not ret:
+                continue
+            self.counters.add("captured")
+            timer = self.timer
+            flip_start = time.perf_counter()
+            if timer is not None:
+                timer.record(CAMERA_READ, flip_start - read_start, self.source)
+
+            index = self.frame_ring.acquire_write()
+            if index is None:
+                continue
+            # 프레임 좌우 반전 (링버퍼 슬롯에 바로 기록)
+            cv2.flip(raw, 1, dst=self.frame_ring.buffer(index))
+            if timer is not None:
+                timer.record(FLIP, time.perf_counter() - flip_start, self.source)
+
+            # 버퍼가 비어 있었을 때만 메인 스레드에 알림 -> 큐에 시그널이 쌓이지 않음
+            if self.frame_ring.commit(index):
+                self.frameReady.emit()
+        # 카메라 리소스 해제
+        self.capture.release()
+        self.ready = False
+
+    def stop(self):
+        # 카메라 스레드 종료 요청
+        self.running = False
+        self.wait()
+
+
+# 카메라 1대를 앱 실행 동안 열어두고, 연결된 화면(CameraPipeline)에 프레임을 넘겨주는 공유 서비스
+# 메인 윈도우 시작 시 미리 장치를 열어두므로 과목(시트)을 바꿔 QR 리더를 다시 열어도 바로 화면이 표시됨
+class CameraService(QObject):
+    frameReady = pyqtSignal()
+    cameraReady = pyqtSignal()
+
+    def __init__(self, source, target_fps=15, buffer_size=3, drop_policy=DROP_OLDEST, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.counters = FrameCounters() # 캡처 프레임 카운터
+        self.frame_ring = FrameRing(buffer_size, drop_policy) # 카메라 -> 화면 프레임 링버퍼
+        self.camera_thread = CameraThread(self.frame_ring, source=source, target_fps=target_fps, counters=self.counters, parent=self)
+        self.camera_thread.active = False
+        self.camera_thread.frameReady.connect(self.frameReady)
+        self.camera_thread.cameraReady.connect(self.cameraReady)
+
+    def is_ready(self):
+        return self.camera_thread.isRunning() and self.camera_thread.ready
+
+    def start(self):
+        # 장치 열기 시작 (백그라운드), 이미 열려 있으면 아무것도 하지 않음
+        if not self.camera_thread.isRunning():
+            self.camera_thread.start()
+
+    def attach(self, timer=None):
+        # 화면 연결 - 이전 화면에서 남은 프레임은 버리고 새 프레임부터 전달
+        index = self.frame_ring.acquire_read(latest=True)
+        if index is not None:
+            self.frame_ring.release(index)
+        self.camera_thread.timer = timer
+        self.camera_thread.active = True
+        self.start()
+
+    def detach(self):
+        # 화면 연결 해제 - 장치는 열어둔 채 프레임 전달만 중지
+        self.camera_thread.active = False
+        self.camera_thread.timer = None
+
+    def stop(self):
+        # 장치 해제
+        self.detach()
+        self.camera_thread.stop()
+
+
+# 카메라 번호(또는 영상 경로) -> CameraService
+_services = {}
+
+
+def get_camera_service(source, target_fps=15, buffer_size=3, drop_policy=DROP_OLDEST):
+    # 카메라마다 서비스는 하나만 생성 (처음 요청한 설정 사용)
+    service = _services.get(source)
+    if service is None:
+        service = CameraService(source, target_fps, buffer_size, drop_policy)
+        _services[source] = service
+    return service
+
+
+def prewarm_cameras(sources, **options):
+    # 메인 윈도우 시작 시 카메라 장치를 미리 열어둠 (영상 파일/스트림은 리더 화면을 열 때 염)
+    for source in sources:
+        if is_device_source(source):
+            get_camera_service(source, **options).start()
+
+
+def release_camera(source):
+    # 카메라 장치 해제 (다음 요청 시 다시 열림)
+    service = _services.pop(source, None)
+    if service is not None:
+        service.stop()
+
+
+def shutdown_cameras():
+    # 앱 종료 시 모든 카메라 장치 해제
+    for source in list(_services):
+        release_camera(source)
@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+import pandas as pd
+
+from core.qr_payload import decode_payload
+from core.qr_reader.payload_cache import PayloadCache
+from core.qr_reader.roster import AttendanceRoster, NAME, ATTEND_TIME, CLASS_COUNT
+from core.qr_reader.stage_timing import PARSE, LOOKUP
+
+# 출석 체크 결과 상태
+CHECKED_IN = "checked_in" # 출석 처리됨
+ALREADY_CHECKED = "already_checked" # 오늘 이미 출석 처리됨
+NOT_FOUND = "not_found" # 출석부에 없는 학번
+
+CheckInResult = namedtuple("CheckInResult", "status student_id name position attend_time class_count source")
+
+
+def parse_student_id(payload: bytes):
+    # QR payload 에서 학번 추출 (compact 형식 / 이전 JSON 형식), 형식이 맞지 않으면 None
+    decoded = decode_payload(payload)
+    return decoded.student_id if decoded is not None else None
+
+
+# 출석 체크 엔진 - 하나의 출석부(df_sheet)에 대해 여러 카메라(디코딩 스레드)가 동시에 호출해도 안전하도록 락 사용
+# 같은 QR 이 여러 카메라에 동시에 비쳐도 payload 캐시와 날짜 확인으로 한 번만 처리
+class CheckInEngine:
+    def __init__(self, roster: AttendanceRoster, journal=None, sheet_name=None, ttl=2.0, timer=None):
+        self.roster = roster
+        self.timer = timer # 단계별 처리 시간 측정 (StageTimer, 없으면 측정하지 않음)
+        self.journal = journal
+        self.sheet_name = sheet_name
+        self.payload_cache = PayloadCache(ttl=ttl) # 최근 처리한 QR payload 캐시
+        self.current_date = datetime.now().strftime("%Y/%m/%d") # 출석부 실행 날짜
+        self.changed = False # 출석 변경 여부
+        self._lock = threading.Lock()
+
+    def process(self, payload: bytes, source=None):
+        # QR payload 1건 처리, 최근에 처리했거나 형식이 맞지 않는 QR 이면 None
+        with self._lock:
+            if self.payload_cache.seen(payload):
+                return None
+        start = time.perf_counter()
+        student_id = parse_student_id(payload)
+        if self.timer is not None:
+            self.timer.record(PARSE, time.perf_counter() - start, source)
+        if not student_id:
+            return None
+        return self.check_in(student_id, source)
+
+    def check_in(self, student_id, source=None) -> CheckInResult:
+        # 출석 처리 (같은 날 출석 처리되었으면 다시 처리하지 않음)
+        start = time.perf_counter()
+        try:
+            return self._check_in(student_id, source)
+        finally:
+            if self.timer is not None:
+                self.timer.record(LOOKUP, time.perf_counter() - start, source)
+
+    def _check_in(self, student_id, source):
+        with self._lock:
+            position = self.roster.position(student_id)
+            if position is None:
+                return CheckInResult(NOT_FOUND, student_id, None, None, None, None, source)
+            student_name = self.roster.get(position, NAME)
+            current_value = self.roster.get(position, ATTEND_TIME)
+            parts = current_value.split() if isinstance(current_value, str) else [] # 빈 문자열(공백만 있는 값)은 출석 기록 없음
+            if parts and parts[0] == self.current_date:
+                return CheckInResult(ALREADY_CHECKED, student_id, student_name, position, current_value, None, source)
+
+            attend_time = datetime.now().strftime('%Y/%m/%d %H:%M:%S')
+            class_count = self.roster.get(position, CLASS_COUNT)
+            if pd.isna(class_count):
+                class_count = 0 # 초기값이 없는 경우 0으로 초기화
+            class_count = int(class_count) + 1
+            self.roster.set(position, ATTEND_TIME, attend_time)
+            self.roster.set(position, CLASS_COUNT, class_count)
+            # 비정상 종료에 대비해 저널에 바로 기록
+            if self.journal is not None:
+                self.journal.append(self.sheet_name, student_id, attend_time, class_count)
+            self.changed = True
+            return CheckInResult(CHECKED_IN, student_id, student_name, position, attend_time, class_count, source)
@@ -0,0 +1,72 @@
+import time
+
+import cv2
+import numpy as np
+
+from core.qr_reader.decoders import DecodedCode, Rect, create_decoder
+
+
+# 디코딩 전처리 단계
+# 1. 그레이스케일 변환은 프레임당 한 번만
+# 2. 최근에 QR 이 인식된 경우 마지막 위치(barcode.rect) 주변 ROI 만 디코딩
+# 3. 축소 이미지 디코딩
+# 4. 모두 실패했을 때만 원본 크기 전체 디코딩
+class RegionDecoder:
+    def __init__(self, decoder=None, downscale=0.5, roi_padding=0.5, roi_ttl=1.0):
+        self.decoder = decoder if decoder is not None else create_decoder()
+        self.downscale = downscale # 축소 비율 (1 이상이면 축소 단계 생략)
+        self.roi_padding = roi_padding # ROI 여백 (QR 크기 대비 비율)
+        self.roi_ttl = roi_ttl # 마지막 인식 위치를 ROI 로 사용하는 시간(초)
+        self.last_rect = None
+        self.last_time = 0
+        self._small = None
+        # 단계별 인식 횟수
+        self.stats = {"roi": 0, "small": 0, "full": 0, "miss": 0}
+
+    def decode(self, frame: np.ndarray):
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        height, width = gray.shape
+
+        # 최근 인식 위치 주변만 디코딩
+        if self.last_rect is not None and time.monotonic() - self.last_time < self.roi_ttl:
+            x0, y0, x1, y1 = self._roi(self.last_rect, width, height)
+            barcodes = self.decoder.decode(gray[y0:y1, x0:x1])
+            if barcodes:
+                return self._found("roi", [_map_barcode(b, x0, y0, 1.0) for b in barcodes])
+
+        # 축소 이미지 디코딩
+        if 0 < self.downscale < 1:
+            size = (max(1, int(width * self.downscale)), max(1, int(height * self.downscale)))
+            if self._small is None or self._small.shape != (size[1], size[0]):
+                self._small = np.empty((size[1], size[0]), np.uint8)
+            cv2.resize(gray, size, dst=self._small, interpolation=cv2.INTER_AREA)
+            barcodes = self.decoder.decode(self._small)
+            if barcodes:
+                return self._found("small", [_map_barcode(b, 0, 0, 1.0 / self.downscale) for b in barcodes])
+
+        # 원본 크기 전체 디코딩
+        barcodes = self.decoder.decode(gray)
+        if barcodes:
+            return self._found("full", list(barcodes))
+        self.stats["miss"] += 1
+        return []
+
+    def _found(self, stage, barcodes):
+        self.stats[stage] += 1
+        self.last_rect = barcodes[0].rect
+        self.last_time = time.monotonic()
+        return barcodes
+
+    def _roi(self, rect, width, height):
+        # 마지막 인식 위치에 여백을 더한 영역 (프레임 밖으로 나가지 않도록 자름)
+        x, y, w, h = rect
+        pad = int(max(w, h) * self.roi_padding)
+        return max(0, x - pad), max(0, y - pad), min(width, x + w + pad), min(height, y + h + pad)
+
+
+def _map_barcode(barcode: DecodedCode, dx, dy, scale):
+    # ROI / 축소 이미지 좌표를 원본 프레임 좌표로 변환
+    x, y, w, h = barcode.rect
+    rect = Rect(int(x * scale) + dx, int(y * scale) + dy, int(w * scale), int(h * scale))
+    polygon = [(int(px * scale) + dx, int(py * scale) + dy) for px, py in barcode.polygon]
+    return barcode._replace(rect=rect, polygon=polygon)
@@ -0,0 +1,110 @@
+import threading
+import time
+
+import numpy as np
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from core.qr_reader.decode_preprocess import RegionDecoder
+from core.qr_reader.stage_timing import DECODE
+
+
+class FrameCounters:
+    # 단계별 프레임 카운터 (캡처 / 디코딩 / 드롭), 여러 스레드에서 갱신되므로 락 사용
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.captured = 0
+        self.decoded = 0
+        self.dropped = 0
+
+    def add(self, name, count=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + count)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "captured": self.captured,
+                "decoded": self.decoded,
+                "dropped": self.dropped,
+            }
+
+
+# QR 디코딩 전용 스레드 - GUI 스레드에서 pyzbar 디코딩을 분리
+# 항상 가장 최근 프레임만 디코딩하고, 처리되지 못한 이전 프레임은 버림(latest-frame-wins)
+class DecodeThread(QThread):
+    # 디코딩 결과 시그널 (DecodedCode 리스트), 출석 체크 결과 시그널 (CheckInResult)
+    qrDecoded = pyqtSignal(list)
+    checkedIn = pyqtSignal(object)
+
+    def __init__(self, counters=None, region_decoder=None, engine=None, source=None, timer=None, parent=None):
+        super().__init__(parent)
+        self.timer = timer # 단계별 처리 시간 측정 (StageTimer)
+        self.engine = engine # 출석 체크 엔진 (여러 디코딩 스레드가 공유)
+        self.source = source # 카메라 번호 또는 영상 경로
+        self.counters = counters if counters is not None else FrameCounters()
+        # 그레이스케일/축소/ROI 전처리 후 디코딩
+        self.region_decoder = region_decoder if region_decoder is not None else RegionDecoder()
+        self.running = True
+        self._cond = threading.Condition()
+        # 이중 버퍼: submit 은 _pending 에 쓰고, run 은 _working 을 디코딩
+        self._pending = None
+        self._working = None
+        self._has_pending = False
+
+    def submit(self, frame: np.ndarray):
+        # 최신 프레임 등록, 아직 디코딩되지 않은 프레임이 있으면 드롭 처리
+        with self._cond:
+            if self._has_pending:
+                self.counters.add("dropped")
+            if self._pending is None or self._pending.shape != frame.shape or self._pending.dtype != frame.dtype:
+                self._pending = frame.copy()
+            else:
+                np.copyto(self._pending, frame)
+            self._has_pending = True
+            self._cond.notify()
+
+    def run(self):
+        while True:
+            with self._cond:
+                while self.running and not self._has_pending:
+                    self._cond.wait()
+                if not self.running:
+                    break
+                # 버퍼 교체 - 디코딩 중에도 submit 이 새 프레임을 받을 수 있음
+                self._pending, self._working = self._working, self._pending
+                self._has_pending = False
+            start = time.perf_counter()
+            try:
+                barcodes = self.decode_frame(self._working)
+            except Exception as e:
+                print(e)
+                continue
+            if self.timer is not None:
+                self.timer.record(DECODE, time.perf_counter() - start, self.source)
+            self.counters.add("decoded")
+            if barcodes:
+                self.qrDecoded.emit(list(barcodes))
+                self.check_in(barcodes)
+
+    def decode_frame(self, frame):
+        return self.region_decoder.decode(frame)
+
+    def check_in(self, barcodes):
+        # 디코딩 스레드에서 바로 출석 처리하고 결과만 GUI 스레드로 전달
+        if self.engine is None:
+            return
+        for barcode in barcodes:
+            try:
+                result = self.engine.process(barcode.data, self.source)
+            except Exception as e:
+                print(e)
+                continue
+            if result is not None:
+                self.checkedIn.emit(result)
+
+    def stop(self):
+        # 디코딩 스레드 종료 요청
+        with self._cond:
+            self.running = False
+            self._cond.notify()
+        self.wait()
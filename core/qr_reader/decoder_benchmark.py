@@ -0,0 +1,61 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import cv2
+
+from core.qr_reader.decoders import DECODERS
+from core.qr_reader.decode_preprocess import RegionDecoder
+from core.qr_reader.frame_sources import iter_frames
+
+
+# 같은 프레임으로 QR 디코더 엔진별 속도(디코딩/초)와 인식률 비교
+# 사용 예: python core/qr_reader/decoder_benchmark.py recorded.mp4 --limit 300
+def benchmark(decoder, frames):
+    found = 0
+    start = time.perf_counter()
+    for frame in frames:
+        if decoder.decode(frame):
+            found += 1
+    elapsed = time.perf_counter() - start
+    return {
+        "frames": len(frames),
+        "fps": len(frames) / elapsed if elapsed else 0.0,
+        "success_rate": found / len(frames) if frames else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="QR decoder engine benchmark")
+    parser.add_argument("source", help="video file, image folder or camera index")
+    parser.add_argument("--decoders", nargs="+", default=list(DECODERS), choices=list(DECODERS))
+    parser.add_argument("--limit", type=int, default=300, help="maximum number of frames")
+    parser.add_argument("--region", action="store_true", help="decode through RegionDecoder (grayscale/downscale/ROI)")
+    args = parser.parse_args(argv)
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    # 모든 디코더가 같은 그레이스케일 프레임을 사용
+    frames = [cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) for _, frame in iter_frames(source, limit=args.limit)]
+    if not frames:
+        print("no frames")
+        return 1
+
+    print(f"{'decoder':<14}{'frames':>8}{'decodes/s':>12}{'success':>10}")
+    for name in args.decoders:
+        try:
+            decoder = DECODERS[name]()
+        except (ImportError, OSError) as e:
+            print(f"{name:<14}unavailable ({e})")
+            continue
+        if args.region:
+            decoder = RegionDecoder(decoder)
+        result = benchmark(decoder, frames)
+        print(f"{name:<14}{result['frames']:>8}{result['fps']:>12.1f}{result['success_rate']:>10.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import os
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+# 디코더 공통 결과 형식 (data 는 bytes, rect 는 (left, top, width, height), polygon 은 (x, y) 목록)
+Rect = namedtuple("Rect", "left top width height")
+DecodedCode = namedtuple("DecodedCode", "data rect polygon")
+
+# 기본 디코더 (환경 변수 QR_DECODER 로 변경 가능)
+DEFAULT_DECODER = os.environ.get("QR_DECODER", "pyzbar")
+
+
+class QRDecoder:
+    # QR 디코더 인터페이스 - 이미지(그레이스케일 또는 BGR)에서 DecodedCode 리스트 반환
+    name = ""
+
+    def decode(self, image: np.ndarray):
+        raise NotImplementedError
+
+
+class PyzbarDecoder(QRDecoder):
+    # pyzbar(libzbar) 기반 디코더 - 네이티브 DLL 이 필요하므로 생성할 때 import
+    name = "pyzbar"
+
+    def __init__(self):
+        from pyzbar.pyzbar import decode, ZBarSymbol
+        self._decode = decode
+        self._symbols = [ZBarSymbol.QRCODE] # QR 코드만 탐색 (바코드 탐색 생략)
+
+    def decode(self, image):
+        return [
+            DecodedCode(barcode.data, Rect(*barcode.rect), [tuple(p) for p in barcode.polygon])
+            for barcode in self._decode(image, symbols=self._symbols)
+        ]
+
+
+class OpenCVDecoder(QRDecoder):
+    # cv2.QRCodeDetector 기반 디코더 (QR 1개)
+    name = "opencv"
+
+    def __init__(self):
+        self._detector = cv2.QRCodeDetector()
+
+    def decode(self, image):
+        text, points, _ = self._detector.detectAndDecode(image)
+        if not text or points is None:
+            return []
+        return [_to_decoded(text, points[0])]
+
+
+class OpenCVMultiDecoder(QRDecoder):
+    # cv2.QRCodeDetector.detectAndDecodeMulti 기반 디코더 (한 프레임에 여러 QR)
+    name = "opencv_multi"
+
+    def __init__(self):
+        self._detector = cv2.QRCodeDetector()
+
+    def decode(self, image):
+        ok, texts, points, _ = self._detector.detectAndDecodeMulti(image)
+        if not ok or points is None:
+            return []
+        return [_to_decoded(text, quad) for text, quad in zip(texts, points) if text]
+
+
+def _to_decoded(text, quad):
+    # OpenCV 꼭짓점 좌표를 pyzbar 와 같은 rect/polygon 형식으로 변환
+    polygon = [(int(x), int(y)) for x, y in quad]
+    xs = [p[0] for p in polygon]
+    ys = [p[1] for p in polygon]
+    rect = Rect(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+    return DecodedCode(text.encode("utf-8"), rect, polygon)
+
+
+DECODERS = {
+    PyzbarDecoder.name: PyzbarDecoder,
+    OpenCVDecoder.name: OpenCVDecoder,
+    OpenCVMultiDecoder.name: OpenCVMultiDecoder,
+}
+
+
+def create_decoder(name=None) -> QRDecoder:
+    # 이름으로 디코더 생성, pyzbar 를 불러올 수 없으면 OpenCV 디코더 사용
+    # (Windows 에서 libzbar-64.dll/libiconv.dll 을 읽지 못하면 ImportError 가 아닌 OSError 발생)
+    name = name or DEFAULT_DECODER
+    if name not in DECODERS:
+        raise ValueError(f"unknown decoder: {name} (available: {', '.join(DECODERS)})")
+    try:
+        return DECODERS[name]()
+    except (ImportError, OSError) as e:
+        print(f"{name} decoder unavailable ({e}), falling back to {OpenCVDecoder.name}")
+        return OpenCVDecoder()
@@ -0,0 +1,78 @@
+import threading
+from collections import deque
+
+import numpy as np
+
+# 버퍼가 가득 찼을 때의 처리 정책
+DROP_OLDEST = "drop_oldest" # 가장 오래된 대기 프레임을 버리고 새 프레임 저장
+DROP_NEWEST = "drop_newest" # 새로 들어온 프레임을 버림
+DROP_POLICIES = (DROP_OLDEST, DROP_NEWEST)
+
+
+# 카메라 스레드와 화면(GUI) 사이의 고정 크기 링버퍼
+# 미리 할당된 프레임 버퍼를 돌려 쓰므로 수업 시간 내내 메모리 사용량이 일정함
+# 슬롯 흐름: free -> (acquire_write) 쓰기 -> (commit) filled -> (acquire_read) 읽기 -> (release) free
+class FrameRing:
+    def __init__(self, capacity=3, drop_policy=DROP_OLDEST):
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"unknown drop policy: {drop_policy}")
+        self.capacity = capacity
+        self.drop_policy = drop_policy
+        self._lock = threading.Lock()
+        self._buffers = []
+        self._free = deque()
+        self._filled = deque()
+        self.written = 0
+        self.dropped = 0
+
+    @property
+    def allocated(self):
+        return bool(self._buffers)
+
+    def allocate(self, shape, dtype=np.uint8):
+        # 프레임 크기에 맞춰 버퍼 미리 할당 (카메라 오픈 시 한 번만 호출)
+        with self._lock:
+            self._buffers = [np.empty(shape, dtype) for _ in range(self.capacity)]
+            self._free = deque(range(self.capacity))
+            self._filled = deque()
+
+    def buffer(self, index) -> np.ndarray:
+        return self._buffers[index]
+
+    def acquire_write(self):
+        # 쓰기용 슬롯 확보, 빈 슬롯이 없으면 정책에 따라 처리 (None 이면 이번 프레임은 버림)
+        with self._lock:
+            if self._free:
+                return self._free.popleft()
+            self.dropped += 1
+            if self.drop_policy == DROP_OLDEST and self._filled:
+                return self._filled.popleft()
+            return None
+
+    def commit(self, index):
+        # 쓰기 완료, 버퍼가 비어 있다가 채워졌으면 True (읽는 쪽에 알릴 필요가 있음)
+        with self._lock:
+            was_empty = not self._filled
+            self._filled.append(index)
+            self.written += 1
+            return was_empty
+
+    def acquire_read(self, latest=True):
+        # 읽기용 슬롯 확보, latest=True 면 최신 프레임만 남기고 나머지는 버림
+        with self._lock:
+            if not self._filled:
+                return None
+            if not latest:
+                return self._filled.popleft()
+            index = self._filled.pop()
+            while self._filled:
+                self._free.append(self._filled.popleft())
+                self.dropped += 1
+            return index
+
+    def release(self, index):
+        # 읽기 완료한 슬롯 반환
+        with self._lock:
+            self._free.append(index)
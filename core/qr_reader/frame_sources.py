@@ -0,0 +1,63 @@
+import os
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def is_image_dir(source):
+    return isinstance(source, str) and os.path.isdir(source)
+
+
+def list_images(folder):
+    # 폴더 안의 이미지 파일 경로 목록 (이름순)
+    return [
+        os.path.join(folder, name)
+        for name in sorted(os.listdir(folder))
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    ]
+
+
+def read_image(path):
+    # cv2.imread 는 윈도우에서 일본어/한국어 경로를 읽지 못하므로 imdecode 사용
+    data = np.fromfile(path, np.uint8)
+    return cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+
+def iter_frames(source, limit=None, step=1):
+    # 동영상 파일 / 이미지 폴더 / 카메라 번호(int)에서 (이름, BGR 프레임)을 차례로 반환
+    count = 0
+    if is_image_dir(source):
+        for path in list_images(source)[::step]:
+            frame = read_image(path)
+            if frame is None:
+                continue
+            yield os.path.basename(path), frame
+            count += 1
+            if limit and count >= limit:
+                return
+        return
+
+    capture = cv2.VideoCapture(source)
+    if not capture.isOpened():
+        raise IOError(f"cannot open video source: {source}")
+    try:
+        index = 0
+        while True:
+            # 건너뛸 프레임은 grab 만 하고 디코딩하지 않음
+            if index % step:
+                if not capture.grab():
+                    break
+                index += 1
+                continue
+            ret, frame = capture.read()
+            if not ret:
+                break
+            yield f"frame {index}", frame
+            index += 1
+            count += 1
+            if limit and count >= limit:
+                break
+    finally:
+        capture.release()
@@ -0,0 +1,33 @@
+import time
+from collections import OrderedDict
+
+
+# QR payload(원본 bytes) 중복 처리 방지 캐시 (LRU + TTL)
+# 학생이 QR 을 계속 비추고 있는 동안 같은 payload 의 JSON 파싱 / 출석부 조회를 생략
+class PayloadCache:
+    def __init__(self, ttl=2.0, maxsize=256):
+        self.ttl = ttl # 같은 payload 를 다시 처리하기까지의 시간(초)
+        self.maxsize = maxsize
+        self._entries = OrderedDict() # payload -> 처리 시각
+        self.hits = 0
+        self.misses = 0
+
+    def seen(self, payload: bytes, now=None) -> bool:
+        # TTL 안에 처리된 payload 면 True(hit), 아니면 처리 시각을 기록하고 False(miss)
+        now = time.monotonic() if now is None else now
+        processed_time = self._entries.get(payload)
+        if processed_time is not None and now - processed_time < self.ttl:
+            self.hits += 1
+            return True
+        self.misses += 1
+        self._entries[payload] = now
+        self._entries.move_to_end(payload)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False) # 가장 오래된 항목 제거
+        return False
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
@@ -0,0 +1,157 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import cv2
+import numpy as np
+import pandas as pd
+
+from core.qr_reader.checkin import CheckInEngine, parse_student_id, CHECKED_IN
+from core.qr_reader.decode_preprocess import RegionDecoder
+from core.qr_reader.decoders import DEFAULT_DECODER, DECODERS, create_decoder
+from core.qr_reader.frame_buffer import FrameRing
+from core.qr_reader.roster import AttendanceRoster, STUDENT_ID, NAME, ATTEND_TIME, CLASS_COUNT
+from core.qr_reader.stage_timing import StageTimer, FLIP, DECODE
+from core.qr_reader.synthetic_frames import render_student_qrs, generate_session
+
+# 합성 프레임을 카메라 없이 리더 파이프라인(캡처 -> 디코딩 -> 파싱 -> 출석 처리)에 재생해 성능 측정
+# CI 에서 오프라인으로 실행해 리더 핫패스의 성능 저하를 확인 (기준 미달 시 종료 코드 1)
+# 사용 예: python core/qr_reader/pipeline_benchmark.py --students 30 --max-miss-rate 0.1 --min-fps 20
+
+
+def make_roster(student_ids):
+    # 메모리상의 과목 시트 출석부 (엑셀 파일 없이)
+    df_sheet = pd.DataFrame({
+        STUDENT_ID: student_ids,
+        NAME: [f"学生{i}" for i in range(len(student_ids))],
+        ATTEND_TIME: [np.nan] * len(student_ids),
+        CLASS_COUNT: [0] * len(student_ids),
+    })
+    return AttendanceRoster(df_sheet)
+
+
+def replay(frames, engine, region_decoder, ring, timer):
+    # CameraThread / DecodeThread 와 같은 순서로 한 프레임씩 처리하고 단계별 시간 기록
+    latencies = [] # 프레임 캡처 ~ 출석 처리 완료
+    decode_times = []
+    first_seen = {} # 학번 -> QR 이 처음 비친 프레임 번호
+    checked_at = {} # 학번 -> 출석 처리된 프레임 번호
+    qr_frames = missed_frames = wrong_reads = 0
+    for number, (raw, expected) in enumerate(frames):
+        start = time.perf_counter()
+        # 캡처: 링버퍼 슬롯에 좌우 반전해서 저장
+        index = ring.acquire_write()
+        cv2.flip(raw, 1, dst=ring.buffer(index))
+        ring.commit(index)
+        index = ring.acquire_read()
+        frame = ring.buffer(index)
+
+        decode_start = time.perf_counter()
+        timer.record(FLIP, decode_start - start)
+        barcodes = region_decoder.decode(frame)
+        decode_times.append(time.perf_counter() - decode_start)
+        timer.record(DECODE, decode_times[-1])
+        for barcode in barcodes:
+            result = engine.process(barcode.data, source=number)
+            if result is not None and result.status == CHECKED_IN:
+                checked_at.setdefault(result.student_id, number)
+        ring.release(index)
+        latencies.append(time.perf_counter() - start)
+
+        if expected is not None:
+            qr_frames += 1
+            first_seen.setdefault(expected, number)
+            read_ids = [parse_student_id(barcode.data) for barcode in barcodes]
+            if expected not in read_ids:
+                missed_frames += 1
+            wrong_reads += sum(1 for student_id in read_ids if student_id != expected)
+        else:
+            wrong_reads += len(barcodes)
+    return latencies, decode_times, first_seen, checked_at, qr_frames, missed_frames, wrong_reads
+
+
+def run_benchmark(decoder_name=DEFAULT_DECODER, students=30, frames_per_student=10, gap_frames=3, seed=0, camera_fps=15, **options):
+    student_ids = [f"S{i:05d}" for i in range(students)]
+    qr_images = render_student_qrs("山田", student_ids)
+    frames = generate_session(qr_images, frames_per_student, gap_frames, seed, **options)
+
+    timer = StageTimer(window=len(frames))
+    engine = CheckInEngine(make_roster(student_ids), timer=timer)
+    region_decoder = RegionDecoder(create_decoder(decoder_name))
+    ring = FrameRing()
+    ring.allocate(frames[0][0].shape)
+    latencies, decode_times, first_seen, checked_at, qr_frames, missed_frames, wrong_reads = replay(frames, engine, region_decoder, ring, timer)
+
+    latency_ms = np.array(latencies) * 1000
+    # 학생이 QR 을 비추기 시작해서 출석 처리될 때까지의 시간 (카메라 fps 기준)
+    wait_frames = [checked_at[student_id] - first_seen[student_id] for student_id in checked_at if student_id in first_seen]
+    return {
+        "decoder": type(region_decoder.decoder).__name__,
+        "frames": len(frames),
+        "decode_fps": len(decode_times) / sum(decode_times),
+        "pipeline_fps": len(latencies) / sum(latencies),
+        "latency_p50_ms": float(np.percentile(latency_ms, 50)),
+        "latency_p95_ms": float(np.percentile(latency_ms, 95)),
+        "latency_p99_ms": float(np.percentile(latency_ms, 99)),
+        "frame_miss_rate": missed_frames / qr_frames if qr_frames else 0.0,
+        "student_miss_rate": 1 - len(checked_at) / len(student_ids),
+        "wrong_reads": wrong_reads,
+        "checkin_wait_ms": float(np.mean(wait_frames)) * 1000 / camera_fps if wait_frames else None,
+        "region_stats": dict(region_decoder.stats),
+        "stages": timer.summary(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="QR reader pipeline replay benchmark (synthetic frames, no camera)")
+    parser.add_argument("--decoder", default=DEFAULT_DECODER, choices=list(DECODERS))
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--frames-per-student", type=int, default=10)
+    parser.add_argument("--gap-frames", type=int, default=3, help="frames without QR between students")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--blur", type=float, default=1.5, help="maximum gaussian blur sigma")
+    parser.add_argument("--noise", type=float, default=6.0, help="gaussian noise sigma")
+    parser.add_argument("--tilt", type=float, default=0.12, help="maximum perspective corner offset (ratio of QR size)")
+    parser.add_argument("--camera-fps", type=float, default=15, help="camera frame rate used to convert frames to time")
+    parser.add_argument("--json", help="write results to this file")
+    # CI 기준값 (지정한 경우만 확인)
+    parser.add_argument("--max-miss-rate", type=float, help="maximum student miss rate")
+    parser.add_argument("--min-fps", type=float, help="minimum decode fps")
+    parser.add_argument("--max-p95-ms", type=float, help="maximum p95 end-to-end latency")
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(
+        args.decoder, args.students, args.frames_per_student, args.gap_frames, args.seed, args.camera_fps,
+        width=args.width, height=args.height, blur=args.blur, noise=args.noise, tilt=args.tilt,
+    )
+    for key, value in result.items():
+        if key == "stages":
+            continue
+        print(f"{key:<20}{value:.3f}" if isinstance(value, float) else f"{key:<20}{value}")
+    print(f"{'stage':<12}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, values in result["stages"].items():
+        print(f"{stage:<12}{values['count']:>8}{values['p50_ms']:>10.3f}{values['p95_ms']:>10.3f}{values['p99_ms']:>10.3f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    failures = []
+    if args.max_miss_rate is not None and result["student_miss_rate"] > args.max_miss_rate:
+        failures.append(f"student miss rate {result['student_miss_rate']:.1%} > {args.max_miss_rate:.1%}")
+    if args.min_fps is not None and result["decode_fps"] < args.min_fps:
+        failures.append(f"decode fps {result['decode_fps']:.1f} < {args.min_fps}")
+    if args.max_p95_ms is not None and result["latency_p95_ms"] > args.max_p95_ms:
+        failures.append(f"p95 latency {result['latency_p95_ms']:.1f}ms > {args.max_p95_ms}ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
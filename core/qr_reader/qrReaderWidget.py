@@ -2,54 +2,154 @@ import cv2
 import re
 import os
 import sys
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QStackedLayout, QLabel, QPushButton, QComboBox
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QStackedLayout, QLabel, QPushButton, QComboBox, QWidget, QGridLayout
 from PyQt6.QtGui import QImage, QPixmap, QIcon, QFont, QMovie
-from PyQt6.QtCore import QTimer, pyqtSignal, Qt, QThread, QByteArray, QUrl
+from PyQt6.QtCore import QTimer, pyqtSignal, Qt, QByteArray, QUrl, QObject
 from PyQt6.QtMultimedia import QSoundEffect
-from pyzbar.pyzbar import decode
-from datetime import datetime
 import logging
 import pandas as pd
 import numpy as np
 from PIL import ImageFont, ImageDraw, Image
-import json
-
-# 락 상태 해결을 위해 스레드 사용
-class CameraThread(QThread):
-    # 프레임 캡처 시그널, 카메라 준비 시그널
-    frameCaptured = pyqtSignal(np.ndarray)
+import time
+
+from core.qr_reader.decode_worker import DecodeThread, FrameCounters
+from core.qr_reader.frame_buffer import DROP_OLDEST
+from core.qr_reader.decode_preprocess import RegionDecoder
+from core.qr_reader.decoders import DEFAULT_DECODER, create_decoder
+from core.qr_reader.roster import AttendanceRoster
+from core.qr_reader.checkin import CheckInEngine, CHECKED_IN, ALREADY_CHECKED
+from core.qr_reader.scan_journal import ScanJournal, compact_journal
+from core.qr_reader.stage_timing import StageTimer, PAINT
+from core.qr_reader.camera_service import get_camera_service, prewarm_cameras, release_camera, is_device_source
+
+# 카메라 1대의 캡처 -> 디코딩 -> 화면 출력 경로
+# 출석 세션은 카메라(출입문) 수만큼 파이프라인을 만들고, 출석 체크 엔진은 모두가 공유
+# 카메라 장치는 공유 서비스(CameraService)가 열어두고, 파이프라인은 화면이 열려 있는 동안만 연결됨
+class CameraPipeline(QObject):
     cameraReady = pyqtSignal()
-    def __init__(self, parent=None):
+
+    def __init__(self, source, engine, decoder_name, target_fps=15, buffer_size=3, drop_policy=DROP_OLDEST, rect_display_time=0.5, timer=None, keep_warm=True, parent=None):
         super().__init__(parent)
-        self.capture = None
-        self.running = False
+        self.source = source
+        self.timer = timer # 단계별 처리 시간 측정 (StageTimer)
+        self.keep_warm = keep_warm # 화면을 닫아도 카메라 장치를 열어둘지 여부
+        self.rect_display_time = rect_display_time # 디코딩된 QR 위치 표시 유지 시간(초)
+        self.counters = FrameCounters() # 디코딩/드롭 프레임 카운터
+        self.camera = get_camera_service(source, target_fps, buffer_size, drop_policy) # 공유 카메라
+        self.frame_ring = self.camera.frame_ring # 카메라 -> 화면 프레임 링버퍼
+        self.attached = False
+
+        # QR 디코딩 스레드 설정 (GUI 스레드에서 디코딩하지 않도록 분리, 출석 처리도 디코딩 스레드에서 수행)
+        region_decoder = RegionDecoder(create_decoder(decoder_name))
+        self.decode_thread = DecodeThread(counters=self.counters, region_decoder=region_decoder, engine=engine, source=source, timer=timer, parent=self)
+        self.decode_thread.qrDecoded.connect(self.on_decoded) # 디코딩 결과 시그널 처리
+        self.last_rects = []
+        self.last_rects_time = 0
 
-    def run(self):
-        self.capture = cv2.VideoCapture(0)  # 카메라 장치 열기
-        self.running = True
-        
-        # 열릴때까지 대기
-        while not self.capture.isOpened():
-            cv2.waitKey(100)
-        
-        # 카메라 준비완료 시그널
-        self.cameraReady.emit()
-
-        while self.running:
-            ret, frame = self.capture.read()
-            if ret:
-                # 프레임 좌우 반전
-                frame = cv2.flip(frame, 1)
-                
-                # 메인 스레드로 프레임 전달
-                self.frameCaptured.emit(frame)
-        # 카메라 리소스 해제
-        self.capture.release()
+        ## 카메라 프레임 표시
+        self.video_label = QLabel()
+        self.video_label.setStyleSheet("border: 2px solid black;")
+
+        # 화면 갱신 타이머 (디스플레이 주사율 기준)
+        self.render_timer = QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.timeout.connect(self.render_frame)
+        self.render_interval = 1000.0 / 60
+        self.last_render_time = 0
+        self.display_buffer = None
+
+    def set_refresh_rate(self, refresh_rate):
+        self.render_interval = 1000.0 / (refresh_rate if refresh_rate > 0 else 60)
+
+    def is_running(self):
+        # 카메라 장치가 열려 프레임을 받을 수 있는 상태
+        return self.camera.is_ready()
+
+    def start(self):
+        # 디코딩 스레드 시작 후 공유 카메라에 연결 (이미 열려 있으면 바로 화면 표시)
+        if not self.decode_thread.isRunning():
+            self.decode_thread.start()
+        if self.attached:
+            return
+        self.camera.frameReady.connect(self.update_frame) # 카메라 프레임 시그널 처리
+        self.camera.cameraReady.connect(self.cameraReady) # 카메라 준비완료 시그널 전달
+        self.camera.attach(self.timer)
+        self.attached = True
+        if self.camera.is_ready():
+            QTimer.singleShot(0, self.cameraReady.emit)
 
     def stop(self):
-        # 카메라 스레드 종료 요청
-        self.running = False
-        self.wait()
+        # 디코딩 스레드 종료, 카메라는 연결만 해제 (keep_warm=False 이거나 카메라 장치가 아니면 해제)
+        if self.attached:
+            self.camera.frameReady.disconnect(self.update_frame)
+            self.camera.cameraReady.disconnect(self.cameraReady)
+            self.camera.detach()
+            self.attached = False
+            if not self.keep_warm or not is_device_source(self.source):
+                release_camera(self.source)
+        self.decode_thread.stop()
+        self.render_timer.stop()
+        logging.debug("camera %s frame counters: %s %s, ring dropped: %d", self.source, self.camera.counters.snapshot(), self.counters.snapshot(), self.frame_ring.dropped)
+        logging.debug("camera %s decode stages: %s", self.source, self.decode_thread.region_decoder.stats)
+
+    def on_decoded(self, barcodes):
+        # 인식된 QR 위치 저장 (화면에 표시)
+        self.last_rects = [tuple(barcode.rect) for barcode in barcodes]
+        self.last_rects_time = time.monotonic()
+
+    def update_frame(self):
+        # 새 프레임 알림 - 캡처 속도가 아닌 화면 주사율 기준으로 다음 갱신 시점에 한 번만 그림
+        if self.render_timer.isActive():
+            return
+        elapsed = (time.monotonic() - self.last_render_time) * 1000
+        self.render_timer.start(max(0, int(self.render_interval - elapsed)))
+
+    def render_frame(self):
+        # 링버퍼에서 최신 프레임을 꺼내 디코딩 스레드에 넘기고 화면 출력
+        if not self.attached:
+            return
+        index = self.frame_ring.acquire_read(latest=True)
+        if index is None:
+            # print("Error: Frame empty")
+            return
+        self.last_render_time = time.monotonic()
+        try:
+            self.show_frame(self.frame_ring.buffer(index))
+        finally:
+            self.frame_ring.release(index)
+
+    def show_frame(self, frame:np.ndarray):
+        self.decode_thread.submit(frame)
+        paint_start = time.perf_counter()
+        # 최근에 인식된 QR 위치 표시
+        if time.monotonic() - self.last_rects_time < self.rect_display_time:
+            for x, y, w, h in self.last_rects:
+                cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 0, 255), 1)
+        # 색 변환 없이 BGR 그대로 QImage 로 감싸고(복사 없음), QPixmap 변환 시 한 번만 복사
+        image = self.scale_to_label(frame)
+        h, w = image.shape[:2]
+        q_img = QImage(image.data, w, h, image.strides[0], QImage.Format.Format_BGR888)
+        self.video_label.setPixmap(QPixmap.fromImage(q_img))
+        if self.timer is not None:
+            self.timer.record(PAINT, time.perf_counter() - paint_start, self.source)
+
+    def scale_to_label(self, frame:np.ndarray):
+        # 라벨보다 큰 프레임은 라벨 크기로 한 번만 축소 (미리 할당한 버퍼 재사용)
+        size = self.video_label.contentsRect().size()
+        h, w = frame.shape[:2]
+        scale = min(size.width() / w, size.height() / h)
+        if scale <= 0 or scale >= 1:
+            return frame
+        shape = (max(1, int(h * scale)), max(1, int(w * scale)), frame.shape[2])
+        if self.display_buffer is None or self.display_buffer.shape != shape:
+            self.display_buffer = np.empty(shape, np.uint8)
+        cv2.resize(frame, (shape[1], shape[0]), dst=self.display_buffer, interpolation=cv2.INTER_AREA)
+        return self.display_buffer
+
+
+def parse_camera_sources(text):
+    # "0" / "0,1" / "0,rtsp://..." 형식 -> 카메라 번호(int) 또는 영상 경로 목록
+    return [int(source) if source.isdigit() else source for source in (s.strip() for s in text.split(",")) if source]
 
 # 리소스 경로를 절대 경로로 반환
 def resource_path(relative_path):
@@ -74,13 +174,34 @@ except IOError:
     font = ImageFont.load_default()
 
 class CameraViewer(QDialog):
+    # 엑셀 저장 완료 시그널, 출석 체크 시 변경된 행 시그널 (시트명, 행 위치, {열 이름: 값})
     qrProcessed = pyqtSignal()
-    last_processed_time = 0
-    processing_interval = 2
+    attendanceChanged = pyqtSignal(str, int, dict)
+    processing_interval = 2 # 같은 QR 을 다시 처리하기까지의 시간(초)
+    # 디코딩된 QR 위치 표시 유지 시간(초)
+    rect_display_time = 0.5
+    # 카메라 프레임 설정 (목표 FPS, 링버퍼 크기, 버퍼가 가득 찼을 때의 처리 정책)
+    target_fps = 15
+    frame_buffer_size = 3
+    frame_drop_policy = DROP_OLDEST
+    # QR 디코더 엔진 (pyzbar / opencv / opencv_multi)
+    decoder_name = DEFAULT_DECODER
+    # 카메라 번호 또는 영상 경로 목록 (환경 변수 QR_CAMERAS="0,1" 처럼 지정하면 출입문마다 카메라 사용)
+    camera_sources = parse_camera_sources(os.environ.get("QR_CAMERAS", "0"))
+    # 단계별 처리 시간 기록 파일 (.csv 또는 .jsonl, 창을 닫을 때 저장), 디버그 오버레이 표시 여부 (F3 키로 전환)
+    timing_log_path = os.environ.get("QR_TIMING_LOG")
+    timing_overlay = os.environ.get("QR_TIMING_OVERLAY", "0") == "1"
+    # 화면을 닫아도 카메라 장치를 열어둘지 여부 (다음 과목 QR 리더를 바로 표시)
+    keep_camera_warm = os.environ.get("QR_CAMERA_KEEP_WARM", "1") == "1"
+
+    @classmethod
+    def prewarm(cls):
+        # 메인 윈도우 시작 시 카메라 장치를 백그라운드에서 미리 열어둠
+        if cls.keep_camera_warm:
+            prewarm_cameras(cls.camera_sources, target_fps=cls.target_fps, buffer_size=cls.frame_buffer_size, drop_policy=cls.frame_drop_policy)
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.json_decoder = json.decoder.JSONDecoder()
         # 윈도우 크기 및 타이틀 설정
         self.resize(600,600)
         self.current_sheet = self.parent().current_sheet
@@ -91,20 +212,26 @@ class CameraViewer(QDialog):
 
         # 현재 선택된 학생 정보를 초기화
         self.selected = None
-        self.current_no = ""
-        self.current_name = ""
-
-        # 출석부 실행 시간 저장
-        self.current_date = datetime.now().strftime("%Y/%m/%d")
 
         # 레이아웃 설정
         layout = QVBoxLayout()
         self.setLayout(layout)
 
-        self.isChanged = False # 출석 변경 여부 확인 -> 변경사항확인용
+        # 이전 실행에서 엑셀에 반영되지 못한 출석 기록(저널)이 있으면 먼저 반영
+        self.journal = ScanJournal(self.file_path)
+        if self.journal.has_entries():
+            try:
+                compact_journal(self.file_path, self.journal)
+            except Exception as e:
+                print(f"Error replaying scan journal: {e}")
 
         # 시트 데이터 읽기(parent로 부터 받아옴)
         self.df_sheet = pd.read_excel(self.file_path, sheet_name=self.current_sheet)
+        self.roster = AttendanceRoster(self.df_sheet) # 학번 -> 행 위치 인덱스
+        # 카메라 읽기 ~ 화면 출력 단계별 처리 시간 측정
+        self.stage_timer = StageTimer(log_path=self.timing_log_path)
+        # 모든 카메라가 공유하는 출석 체크 엔진
+        self.engine = CheckInEngine(self.roster, self.journal, self.current_sheet, ttl=self.processing_interval, timer=self.stage_timer)
         self.sheet_label = QLabel(self)
         self.sheet_label.setFont(QFont(font_path,15))
         self.sheet_label.setText(f"Current Class: {self.current_sheet}")
@@ -127,11 +254,10 @@ class CameraViewer(QDialog):
         self.stack_layout = QStackedLayout()
         self.stack_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
     
-        ## 카메라 프레임 표시
-        self.video_label = QLabel(self)
-        self.video_label.setMinimumSize(640,480)
-        self.video_label.setStyleSheet("border: 2px solid black;")
-        self.stack_layout.addWidget(self.video_label)
+        ## 카메라 프레임 표시 (카메라가 여러 대이면 격자로 배치)
+        self.video_widget = QWidget(self)
+        video_grid = QGridLayout(self.video_widget)
+        self.stack_layout.addWidget(self.video_widget)
 
         # 로딩 화면 표시
         self.loading_label = QLabel(self)
@@ -144,10 +270,26 @@ class CameraViewer(QDialog):
         self.movie.start()
         layout.addLayout(self.stack_layout)
 
-        # 카메라 스레드 초기화 설정        
-        self.camera_thread = CameraThread(parent=self)
-        self.camera_thread.frameCaptured.connect(self.update_frame) # 카메라 프레임 시그널 처리
-        self.camera_thread.cameraReady.connect(self.on_camera_ready) # 카메라 준비완료 시그널 처리
+        # 카메라별 캡처/디코딩 파이프라인 초기화 설정
+        self.pipelines = []
+        columns = int(np.ceil(np.sqrt(len(self.camera_sources))))
+        for i, source in enumerate(self.camera_sources):
+            pipeline = CameraPipeline(source, self.engine, self.decoder_name, self.target_fps, self.frame_buffer_size, self.frame_drop_policy, self.rect_display_time, timer=self.stage_timer, keep_warm=self.keep_camera_warm, parent=self)
+            pipeline.video_label.setMinimumSize(640 // columns, 480 // columns)
+            pipeline.cameraReady.connect(self.on_camera_ready) # 카메라 준비완료 시그널 처리
+            pipeline.decode_thread.checkedIn.connect(self.on_checked_in) # 출석 체크 결과 시그널 처리
+            video_grid.addWidget(pipeline.video_label, i // columns, i % columns)
+            self.pipelines.append(pipeline)
+
+        # 단계별 처리 시간 디버그 오버레이 (카메라 화면 위에 표시)
+        self.timing_label = QLabel(self.video_widget)
+        self.timing_label.setStyleSheet("background-color: rgba(0, 0, 0, 160); color: white; font-family: monospace; padding: 4px;")
+        self.timing_label.move(8, 8)
+        self.timing_label.setVisible(self.timing_overlay)
+        self.timing_timer = QTimer(self)
+        self.timing_timer.timeout.connect(self.update_timing_overlay)
+        if self.timing_overlay:
+            self.timing_timer.start(500)
 
         # 종료 버튼
         close_btn = QPushButton("Close")
@@ -164,6 +306,11 @@ class CameraViewer(QDialog):
         self.message_timer.setSingleShot(True)
         self.message_timer.timeout.connect(lambda: self.message_label.setText(" "))
 
+        # 화면 갱신 주기 (디스플레이 주사율 기준)
+        refresh_rate = self.screen().refreshRate() if self.screen() else 0
+        for pipeline in self.pipelines:
+            pipeline.set_refresh_rate(refresh_rate)
+
         self.camera_Run()
 
 
@@ -172,7 +319,7 @@ class CameraViewer(QDialog):
         if show:
             self.stack_layout.setCurrentWidget(self.loading_label)
         else:
-            self.stack_layout.setCurrentWidget(self.video_label)
+            self.stack_layout.setCurrentWidget(self.video_widget)
     
     def on_camera_ready(self):
         # 카메라 준비 완료 시 로딩 화면 숨기기
@@ -184,14 +331,17 @@ class CameraViewer(QDialog):
         self.selected = self.select_time.currentText().strip()
         self.df_sheet[self.selected] = self.df_sheet[self.selected].astype(str)
         if self.selected != "Select 回目":
-            if not self.camera_thread.isRunning():
+            if not self.is_camera_running():
                 self.show_loading(True)
             self.start_camera()
     def camera_Run(self):
-        if not self.camera_thread.isRunning():
+        if not self.is_camera_running():
             self.show_loading(True)
         self.start_camera()
 
+    def is_camera_running(self):
+        return any(pipeline.is_running() for pipeline in self.pipelines)
+
     def load_times(self):
         # 시간 목록 로딩
         self.select_time.addItem("Select 回目")
@@ -200,52 +350,55 @@ class CameraViewer(QDialog):
     
     def start_camera(self):
         # 카메라 시작
-        if not self.camera_thread.isRunning():
-            self.camera_thread.start()
+        for pipeline in self.pipelines:
+            pipeline.start()
+
+    def on_checked_in(self, result):
+        # 디코딩 스레드에서 처리된 출석 체크 결과 표시
+        if result.status == CHECKED_IN:
+            self.show_temporary_message(f"{result.student_id}, {result.name} Attendance has been recorded.")
+            self.sound.play()
+            self.attendanceChanged.emit(self.current_sheet, result.position, {'出席時間': result.attend_time, '授業回数': result.class_count})
+        elif result.status == ALREADY_CHECKED:
+            self.show_temporary_message(f"{result.student_id}, {result.name} Already Checked.")
+        else:
+            self.show_temporary_message("Not existed in Attendance list, Please contact the administrator.")
 
-    def update_frame(self, q_img:np.ndarray):
-        # 카메라 프레임 업데이트
-        frame = self.read_frame(q_img)
-        if frame is None:
-            # print("Error: Frame empty")
-            return
-        try:
-            rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        except cv2.error as e:
-            print(e)
+    def keyPressEvent(self, event):
+        # F3 키로 단계별 처리 시간 오버레이 표시 전환
+        if event.key() == Qt.Key.Key_F3:
+            self.toggle_timing_overlay()
             return
-        h, w, ch = rgb_image.shape
-        q_img = QImage(rgb_image.data, w, h, ch * w, QImage.Format.Format_RGB888)
-        self.video_label.setPixmap(QPixmap.fromImage(q_img))
+        super().keyPressEvent(event)
+
+    def toggle_timing_overlay(self):
+        self.timing_overlay = not self.timing_overlay
+        self.timing_label.setVisible(self.timing_overlay)
+        if self.timing_overlay:
+            self.update_timing_overlay()
+            self.timing_timer.start(500)
+        else:
+            self.timing_timer.stop()
 
-    def read_frame(self, frame):
-        # 프레임에서 QR 코드 디코딩
-        try:
-            barcodes = decode(frame)
-            for barcode in barcodes:
-                x, y, w, h = barcode.rect
-                barcode_info = barcode.data.decode('unicode_escape')
-                info = self.json_decoder.decode(barcode_info)
-                # grade = info['学年']
-                student_no = info['学籍番号']
-                # name1 = info['氏名']
-                # name2 = info['カナ']
-                # email = info['学生メールアドレス']
-                self.current_no = student_no
-                # self.current_name = name1
-                # barcode_array = barcode_info.split(',') # 학번, 이름
-                cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 0, 255), 1)
-                # QR 코드가 읽혔을 때 출석 처리
-                if (self.message_label.text() == " "):
-                    self.updateAttendance()
-            return frame
-        except Exception as e:
-            print(e)
+    def update_timing_overlay(self):
+        # 단계명, p50, p95(ms), 구간 히스토그램(0-1-2-5-10-20-50-100-200ms)
+        lines = self.stage_timer.overlay_lines()
+        self.timing_label.setText("\n".join(["stage          p50    p95"] + lines) if lines else "waiting for frames...")
+        self.timing_label.adjustSize()
+        self.timing_label.raise_()
 
     def close_camera(self):
-        # 카메라 스레드 종료
-        self.camera_thread.stop()
-        self.camera_thread.quit()
+        # 카메라 스레드 및 디코딩 스레드 종료
+        for pipeline in self.pipelines:
+            pipeline.stop()
+        self.timing_timer.stop()
+        logging.debug("payload cache: %s", self.engine.payload_cache.stats())
+        logging.debug("stage timing: %s", self.stage_timer.summary())
+        # 단계별 처리 시간 기록 저장
+        try:
+            self.stage_timer.dump()
+        except OSError as e:
+            print(f"Error saving stage timing: {e}")
         self.close()
 
     def closeEvent(self, event):
@@ -254,29 +407,18 @@ class CameraViewer(QDialog):
         super().closeEvent(event)
 
         # 변경사항이 있으면 시트에 반영, 없으면 그냥 종료
-        if not self.isChanged:
+        if not self.engine.changed:
             super().closeEvent(event)
             return
 
-        # 종합 출결 시트(出席調査)에 변경사항이 있으면 변경사항 저장 -> 나중에 구현
-        # self.df_sheet 의 내용을 出席調査시트에 반영
-        attendance_sheet = pd.read_excel(self.file_path, sheet_name="出席調査")
-        for index, row in self.df_sheet.iterrows():
-            student_id = row['学籍番号']
-            student_name = row['氏名']
-            class_name = self.current_sheet
-            # 学籍番号(학번), 氏名(이름), クラス名(과목명)으로 학생 찾기기
-            student_row = attendance_sheet[(attendance_sheet['学籍番号'] == student_id) & (attendance_sheet['氏名'] == student_name) & (attendance_sheet['クラス名'] == class_name)]
-            if not student_row.empty:
-                student_index = student_row.index[0]
-                # 
-                attendance_sheet.at[student_index, '授業回数'] = row['授業回数'] # 출석 일수 업데이트
-                attendance_sheet.at[student_index, '欠席数'] = row['欠席数'] # 결석 일수 업데이트
-
-        # 변경사항 반영
-        with pd.ExcelWriter(self.file_path, mode='a', engine='openpyxl', if_sheet_exists='replace') as writer:
-            self.df_sheet.to_excel(writer, sheet_name=self.current_sheet, index=False)
-            attendance_sheet.to_excel(writer, sheet_name="出席調査", index=False)
+        # 종합 출결 시트(出席調査)에 변경사항이 있으면 변경사항 저장
+        # self.df_sheet 및 저널 기록을 出席調査시트에 반영하고 한 번에 저장, 저장에 실패하면 저널은 남겨둠
+        try:
+            compact_journal(self.file_path, self.journal, {self.current_sheet: self.df_sheet})
+        except Exception as e:
+            print(f"Error saving attendance: {e}")
+            self.journal.close()
+            return
         self.qrProcessed.emit()
 
     # def update_column_name(self, col_name):
@@ -297,53 +439,3 @@ class CameraViewer(QDialog):
             self.message_timer.stop()
         self.message_label.setText(message)
         self.message_timer.start(duration)
-    # 授業回数(출석일수) 열 업데이트, 결석 일수 업데이트는 시트 종료시에 처리(?) 잘 모르겠음
-    def updateAttendance(self):
-        # 출석 처리
-        student_id = self.current_no
-        # student_name = self.current_name
-        print(student_id)
-        if not student_id:
-            return
-        
-        # 학번, 이름 공백 제거
-        self.df_sheet['学籍番号'] = self.df_sheet['学籍番号'].astype(str).str.strip()
-        self.df_sheet['氏名'] = self.df_sheet['氏名'].astype(str).str.strip()
-
-        # 시트(데이터 프레임)에서 일치하는 학생 찾기
-        student_row = self.df_sheet[
-            (self.df_sheet['学籍番号'] == student_id)
-        ]
-        if not student_row.empty:
-            student_index = student_row.index[0]
-            current_value = student_row['出席時間'].values[0]
-
-            try:
-                current_value = current_value.split()[0]
-            except:
-                print("날짜 데이터가 아님.")
-
-            # 시간 기준으로 출석 처리 같은 날 출석 처리되었으면 다시 출석 처리하지 않음
-            if current_value != self.current_date:
-                # 출석 처리
-                self.df_sheet.at[student_index, '出席時間'] = datetime.now().strftime('%Y/%m/%d %H:%M:%S')
-                # 초기값이 없는 경우 0으로 초기화
-                if pd.isna(self.df_sheet.at[student_index, '授業回数']):
-                    self.df_sheet.at[student_index, '授業回数'] = 0  # 초기값 0으로 설정
-                self.df_sheet.at[student_index, '授業回数'] += 1
-                # self.processed_students.add(student_id)
-                # self.qr_label.setText(f"{student_id} Attendance has been recorded.")
-                self.show_temporary_message(f"{student_id}, {student_row['氏名'].values[0]} Attendance has been recorded.")
-                self.sound.play()
-                self.qrProcessed.emit()
-            else:
-                self.show_temporary_message(f"{student_id}, {student_row['氏名'].values[0]} Already Checked.")
-                # self.show_temporary_message(f"{student_id}, {student_name} Attendance has been recorded.")
-                return
-        else:
-            self.show_temporary_message("Not existed in Attendance list, Please contact the administrator.")
-            return
-        
-        if self.isChanged == False:
-            self.isChanged = True
-    
\ No newline at end of file
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+# 출석부 시트 열 이름
+STUDENT_ID = "学籍番号"
+NAME = "氏名"
+CLASS_NAME = "クラス名"
+ATTEND_TIME = "出席時間"
+CLASS_COUNT = "授業回数"
+ABSENT_COUNT = "欠席数"
+
+
+def normalize_ids(series: pd.Series) -> pd.Series:
+    # 학번/이름 비교용 정규화 (문자열 변환 + 공백 제거)
+    return series.astype(str).str.strip()
+
+
+# 과목 시트 출석부 - 열리는 시점에 한 번만 정규화하고 학번 -> 행 위치 인덱스를 유지
+# 출석 체크마다 전체 열을 다시 변환하거나 전체 행을 검색하지 않음(O(1) 조회)
+class AttendanceRoster:
+    def __init__(self, df_sheet: pd.DataFrame):
+        df_sheet[STUDENT_ID] = normalize_ids(df_sheet[STUDENT_ID])
+        df_sheet[NAME] = normalize_ids(df_sheet[NAME])
+        if ATTEND_TIME in df_sheet.columns:
+            # 빈 열은 float 로 읽히므로 날짜 문자열을 넣을 수 있도록 object 로 변환
+            df_sheet[ATTEND_TIME] = df_sheet[ATTEND_TIME].astype(object)
+        self.df = df_sheet
+        self._columns = {name: df_sheet.columns.get_loc(name) for name in df_sheet.columns}
+        self._positions = {}
+        for position, student_id in enumerate(df_sheet[STUDENT_ID].tolist()):
+            # 학번이 중복된 경우 첫 번째 행 사용 (기존 동작과 동일)
+            self._positions.setdefault(student_id, position)
+
+    def __len__(self):
+        return len(self.df)
+
+    def position(self, student_id):
+        # 학번으로 행 위치 조회, 없으면 None
+        return self._positions.get(str(student_id).strip())
+
+    def get(self, position, column):
+        return self.df.iat[position, self._columns[column]]
+
+    def set(self, position, column, value):
+        self.df.iat[position, self._columns[column]] = value
+
+
+def _merge_keys(df: pd.DataFrame, class_name=None) -> pd.MultiIndex:
+    # (学籍番号, 氏名, クラス名) 비교 키 - 시트마다 학번 타입이 다를 수 있어 문자열로 정규화
+    class_names = normalize_ids(df[CLASS_NAME]) if class_name is None else [str(class_name).strip()] * len(df)
+    return pd.MultiIndex.from_arrays([normalize_ids(df[STUDENT_ID]), normalize_ids(df[NAME]), class_names])
+
+
+def merge_into_attendance(attendance_sheet: pd.DataFrame, df_sheet: pd.DataFrame, class_name):
+    # 과목 시트의 授業回数/欠席数 를 종합 출결 시트(出席調査)에 반영 (키 조인으로 한 번에 처리)
+    # 学籍番号(학번), 氏名(이름), クラス名(과목명)이 같은 첫 번째 행을 갱신하고, 찾지 못한 과목 시트 행을 반환
+    attendance_keys = _merge_keys(attendance_sheet)
+    first = ~attendance_keys.duplicated(keep='first')
+    target_positions = np.flatnonzero(first)
+    matched_positions = attendance_keys[first].get_indexer(_merge_keys(df_sheet, class_name))
+
+    matched = matched_positions >= 0
+    # 과목 시트에 같은 학생이 여러 번 있으면 마지막 행의 값 사용
+    sheet_rows = np.flatnonzero(matched)
+    targets = pd.Series(target_positions[matched_positions[sheet_rows]])
+    last = ~targets.duplicated(keep='last').to_numpy()
+    sheet_rows = sheet_rows[last]
+    targets = targets.to_numpy()[last]
+
+    for column in (CLASS_COUNT, ABSENT_COUNT): # 출석 일수, 결석 일수 업데이트
+        attendance_sheet.iloc[targets, attendance_sheet.columns.get_loc(column)] = df_sheet[column].to_numpy()[sheet_rows]
+    return df_sheet[~matched]
@@ -0,0 +1,116 @@
+import json
+import os
+import shutil
+
+import pandas as pd
+
+from core.qr_reader.roster import AttendanceRoster, merge_into_attendance, ATTEND_TIME, CLASS_COUNT
+
+ATTENDANCE_SHEET = "出席調査"
+
+
+# 출석 체크 기록을 엑셀 파일 옆의 작은 저널 파일(JSON Lines)에 바로 추가
+# 프로그램이 비정상 종료되어도 기록이 남고, 다음 실행 시 엑셀에 한 번에 반영(compact)
+class ScanJournal:
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.path = os.path.splitext(file_path)[0] + ".scan_journal.jsonl"
+        self._file = None
+
+    def has_entries(self):
+        return os.path.exists(self.path) and os.path.getsize(self.path) > 0
+
+    def _truncate_partial_line(self):
+        # 기록 도중 종료되어 마지막 줄이 끊겨 있으면 마지막 완전한 줄까지 잘라냄
+        # (그대로 추가하면 새 기록이 끊긴 줄 뒤에 붙어 함께 무시됨)
+        if not self.has_entries():
+            return
+        with open(self.path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b"\n":
+                return
+            f.seek(0)
+            data = f.read()
+            f.truncate(data.rfind(b"\n") + 1)
+
+    def append(self, sheet, student_id, attend_time, class_count):
+        # 출석 1건 기록 (디스크까지 바로 기록)
+        if self._file is None:
+            self._truncate_partial_line()
+            self._file = open(self.path, "a", encoding="utf-8")
+        entry = {"sheet": sheet, "学籍番号": str(student_id), ATTEND_TIME: attend_time, CLASS_COUNT: int(class_count)}
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def entries(self):
+        # 저널 기록 읽기, 기록 도중 종료되어 깨진 줄은 무시
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return entries
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def clear(self):
+        # 엑셀에 반영이 끝난 저널 삭제
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def apply_entries(roster: AttendanceRoster, entries):
+    # 저널 기록을 출석부에 적용 (절대값을 기록하므로 여러 번 적용해도 결과가 같음)
+    for entry in entries:
+        position = roster.position(entry["学籍番号"])
+        if position is None:
+            continue
+        roster.set(position, ATTEND_TIME, entry[ATTEND_TIME])
+        roster.set(position, CLASS_COUNT, entry[CLASS_COUNT])
+
+
+def compact_journal(file_path, journal=None, sheets=None):
+    # 저널 기록을 과목 시트와 出席調査 시트에 반영하고 엑셀 파일을 한 번만 저장
+    # sheets: 이미 메모리에 있는 과목 시트 {시트명: DataFrame} (다시 읽지 않음)
+    journal = journal if journal is not None else ScanJournal(file_path)
+    sheets = dict(sheets or {})
+    by_sheet = {}
+    for entry in journal.entries():
+        by_sheet.setdefault(entry["sheet"], []).append(entry)
+    if not by_sheet and not sheets:
+        return False
+
+    for sheet_name in by_sheet:
+        if sheet_name not in sheets:
+            sheets[sheet_name] = pd.read_excel(file_path, sheet_name=sheet_name)
+    attendance_sheet = pd.read_excel(file_path, sheet_name=ATTENDANCE_SHEET)
+    for sheet_name, df_sheet in sheets.items():
+        apply_entries(AttendanceRoster(df_sheet), by_sheet.get(sheet_name, []))
+        unmatched = merge_into_attendance(attendance_sheet, df_sheet, sheet_name)
+        if not unmatched.empty:
+            print(f"{sheet_name}: {len(unmatched)} rows not found in {ATTENDANCE_SHEET}: {', '.join(unmatched['学籍番号'].astype(str))}")
+
+    # 복사본에 기록한 뒤 교체 (저장 중 종료/실패해도 원본 엑셀과 저널이 그대로 남아 다음 실행 시 다시 반영)
+    root, ext = os.path.splitext(file_path)
+    tmp_path = f"{root}.tmp{ext}"
+    try:
+        shutil.copyfile(file_path, tmp_path)
+        with pd.ExcelWriter(tmp_path, mode='a', engine='openpyxl', if_sheet_exists='replace') as writer:
+            for sheet_name, df_sheet in sheets.items():
+                df_sheet.to_excel(writer, sheet_name=sheet_name, index=False)
+            attendance_sheet.to_excel(writer, sheet_name=ATTENDANCE_SHEET, index=False)
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    journal.clear()
+    return True
@@ -0,0 +1,125 @@
+import csv
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+# 리더 처리 단계 (카메라 읽기 -> 좌우 반전 -> QR 디코딩 -> payload 파싱 -> 출석부 조회/갱신 -> 화면 출력)
+CAMERA_READ = "camera_read"
+FLIP = "flip"
+DECODE = "decode"
+PARSE = "parse"
+LOOKUP = "lookup"
+PAINT = "paint"
+STAGES = (CAMERA_READ, FLIP, DECODE, PARSE, LOOKUP, PAINT)
+
+# 오버레이 히스토그램 구간(ms) 과 막대 문자
+HISTOGRAM_BINS = (0, 1, 2, 5, 10, 20, 50, 100, 200, float("inf"))
+_BARS = " ▁▂▃▄▅▆▇█"
+
+
+# 최근 window 개 측정값(초)만 유지하는 단계별 히스토그램
+class RollingHistogram:
+    def __init__(self, window=300):
+        self._samples = deque(maxlen=window)
+        self.count = 0 # 전체 측정 횟수
+        self.max = 0.0
+
+    def add(self, seconds):
+        self._samples.append(seconds)
+        self.count += 1
+        self.max = max(self.max, seconds)
+
+    def percentiles(self, qs=(50, 95, 99)):
+        # 최근 측정값의 백분위수(ms), 측정값이 없으면 None
+        if not self._samples:
+            return None
+        return [float(v) * 1000 for v in np.percentile(np.fromiter(self._samples, float), qs)]
+
+    def histogram(self, bins=HISTOGRAM_BINS):
+        # 구간(ms)별 측정 횟수
+        counts, _ = np.histogram(np.fromiter(self._samples, float) * 1000, bins=bins)
+        return counts
+
+    def __len__(self):
+        return len(self._samples)
+
+
+# 단계별 처리 시간 측정 - 카메라/디코딩/GUI 스레드가 동시에 기록하므로 락 사용
+# log_path 를 지정하면 모든 측정값을 보관했다가 dump() 로 CSV(.csv) 또는 JSONL 파일에 저장
+class StageTimer:
+    def __init__(self, window=300, log_path=None):
+        self.histograms = {stage: RollingHistogram(window) for stage in STAGES}
+        self.log_path = log_path
+        self._records = [] if log_path else None # (시각, 카메라, 단계, ms)
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds, source=None):
+        with self._lock:
+            self.histograms[stage].add(seconds)
+            if self._records is not None:
+                self._records.append((time.time(), source, stage, seconds * 1000))
+
+    @contextmanager
+    def measure(self, stage, source=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, source)
+
+    def summary(self):
+        # 단계별 측정 횟수, 백분위수(ms), 최댓값(ms)
+        with self._lock:
+            result = {}
+            for stage, histogram in self.histograms.items():
+                values = histogram.percentiles()
+                if values is None:
+                    continue
+                result[stage] = {
+                    "count": histogram.count,
+                    "p50_ms": values[0],
+                    "p95_ms": values[1],
+                    "p99_ms": values[2],
+                    "max_ms": histogram.max * 1000,
+                }
+            return result
+
+    def overlay_lines(self):
+        # 화면 오버레이용 텍스트 (단계별 p50/p95 와 구간 히스토그램 막대)
+        lines = []
+        with self._lock:
+            for stage, histogram in self.histograms.items():
+                values = histogram.percentiles()
+                if values is None:
+                    continue
+                counts = histogram.histogram()
+                peak = counts.max() or 1
+                bars = "".join(_BARS[int(round(count / peak * (len(_BARS) - 1)))] for count in counts)
+                lines.append(f"{stage:<12}{values[0]:7.1f}{values[1]:7.1f} ms |{bars}|")
+        return lines
+
+    def dump(self, path=None):
+        # 측정값을 파일에 추가 저장, 저장한 경로 반환 (저장할 내용이 없으면 None)
+        path = path or self.log_path
+        with self._lock:
+            records, self._records = self._records, ([] if self._records is not None else None)
+        if not path or not records:
+            return None
+        new_file = not os.path.exists(path)
+        with open(path, "a", encoding="utf-8", newline="") as f:
+            if path.lower().endswith(".csv"):
+                writer = csv.writer(f)
+                if new_file:
+                    writer.writerow(["time", "source", "stage", "ms"])
+                for timestamp, source, stage, ms in records:
+                    writer.writerow([datetime.fromtimestamp(timestamp).isoformat(timespec="milliseconds"), source, stage, f"{ms:.3f}"])
+            else:
+                for timestamp, source, stage, ms in records:
+                    f.write(json.dumps({"time": timestamp, "source": source, "stage": stage, "ms": round(ms, 3)}) + "\n")
+        return path
@@ -0,0 +1,64 @@
+import cv2
+import numpy as np
+
+from core.qr_sheet_create.qr_render import qr_payload, teacher_label, render_qr_image
+
+
+# 웹캠 / 학생 없이 리더 성능을 측정하기 위한 합성 카메라 프레임 생성
+# QR 은 create_seperate_file 과 같은 payload(担当教員名, 学籍番号)와 같은 스타일(둥근 모듈 + 교수명)로 생성
+
+
+def render_student_qr(teacher_name, student_id, label_image=None):
+    # 출석부 QR 과 동일한 이미지를 BGR 배열로 반환
+    qr_image = render_qr_image(qr_payload(teacher_name, student_id), label_image)
+    return cv2.cvtColor(np.asarray(qr_image.convert("RGB")), cv2.COLOR_RGB2BGR)
+
+
+def render_student_qrs(teacher_name, student_ids):
+    # 교수명 이미지는 teacher_label 의 교수별 캐시에서 가져옴 (출석부 QR 생성과 같은 이미지)
+    label_image = teacher_label(teacher_name)
+    return {student_id: render_student_qr(teacher_name, student_id, label_image) for student_id in student_ids}
+
+
+def _background(rng, width, height):
+    # 조명이 고르지 않은 배경 (저해상도 랜덤 패턴을 확대)
+    small = rng.integers(60, 200, size=(height // 40 + 1, width // 40 + 1, 3), dtype=np.uint8)
+    return cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+
+
+def composite_frame(rng, qr_bgr, width=640, height=480, min_size=140, max_size=260, tilt=0.12, blur=1.5, noise=6.0):
+    # QR 을 임의 위치/크기로 원근 변환해 배경에 합성하고 블러와 노이즈 추가
+    frame = _background(rng, width, height)
+    if qr_bgr is not None:
+        size = int(rng.integers(min_size, max_size + 1))
+        x = int(rng.integers(0, width - size))
+        y = int(rng.integers(0, height - size))
+        h, w = qr_bgr.shape[:2]
+        src = np.float32([[0, 0], [w, 0], [w, h], [0, h]])
+        dst = np.float32([[x, y], [x + size, y], [x + size, y + size], [x, y + size]])
+        dst += rng.uniform(-tilt, tilt, size=(4, 2)).astype(np.float32) * size
+        matrix = cv2.getPerspectiveTransform(src, dst)
+        warped = cv2.warpPerspective(qr_bgr, matrix, (width, height))
+        mask = cv2.warpPerspective(np.full((h, w), 255, np.uint8), matrix, (width, height))
+        np.copyto(frame, warped, where=(mask > 127)[..., None])
+    if blur > 0:
+        sigma = float(rng.uniform(0, blur))
+        if sigma > 0.3:
+            frame = cv2.GaussianBlur(frame, (0, 0), sigma)
+    if noise > 0:
+        frame = cv2.add(frame.astype(np.float32), rng.normal(0, noise, frame.shape).astype(np.float32))
+        frame = np.clip(frame, 0, 255).astype(np.uint8)
+    return frame
+
+
+def generate_session(qr_images, frames_per_student=10, gap_frames=3, seed=0, **options):
+    # 학생이 차례로 카메라 앞에 QR 을 비추는 장면 재현
+    # (프레임, 비추고 있는 학번 또는 None) 목록 반환 - 학생 사이에는 QR 이 없는 프레임 gap_frames 장
+    rng = np.random.default_rng(seed)
+    frames = []
+    for student_id, qr_bgr in qr_images.items():
+        for _ in range(frames_per_student):
+            frames.append((composite_frame(rng, qr_bgr, **options), student_id))
+        for _ in range(gap_frames):
+            frames.append((composite_frame(rng, None, **options), None))
+    return frames
@@ -1,5 +1,6 @@
 import sys
 import os
+import multiprocessing
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -8,6 +9,7 @@ from core.qr_sheet_create.main_window import MainWindow
 
 print(sys.path)
 if __name__ == "__main__":
+    multiprocessing.freeze_support() # QR 이미지 생성 프로세스 풀 (PyInstaller 실행파일)
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -9,6 +9,11 @@ class MainWindow(QMainWindow, GuiMainWindow):
         super().__init__()
         self.setup_gui(self)
 
+    def closeEvent(self, event):
+        # 실행 중인 SEPERATE 파일 생성 작업 정리
+        self.stop_seperate_job()
+        super().closeEvent(event)
+
     # ui를 제외한 로직은 여기에 빼서 구현하려했는데, 시간상 gui_main_window.py에 구현함
     # def openFile(self):
     #     options = QFileDialog.Options()
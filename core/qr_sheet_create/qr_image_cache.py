@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import tempfile
+
+# 생성된 QR 이미지(PNG) 디스크 캐시
+# 키는 payload + 교수명 + 렌더링 설정의 해시이므로 내용이 같은 QR 은 다시 생성하지 않음 (학기/명단 수정 후 재생성 시 새 학생만 생성)
+# 전체 크기가 max_bytes 를 넘으면 가장 오래 사용하지 않은 파일부터 삭제 (LRU, 파일 수정 시각 기준)
+DEFAULT_MAX_MB = 200
+
+
+def default_cache_dir():
+    # Windows: %LOCALAPPDATA%\qr_attendance\qr_cache, 그 외: ~/.cache/qr_attendance/qr_cache
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "qr_attendance", "qr_cache")
+
+
+class QRImageCache:
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._total_bytes = None # 처음 저장할 때 디렉토리를 한 번 스캔
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(payload, label_text, params):
+        # 내용 주소 키 (sha256)
+        source = json.dumps([payload, label_text, params], ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        # 한 디렉토리에 파일이 너무 많아지지 않도록 앞 2자리로 하위 디렉토리 분리
+        return os.path.join(self.directory, key[:2], key + ".png")
+
+    def get(self, key):
+        # 캐시된 PNG bytes, 없으면 None (사용 시각 갱신)
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key, data: bytes):
+        # 임시 파일에 쓴 뒤 교체 (중간에 종료되어도 깨진 파일이 남지 않음)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing QR image cache: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        if self._total_bytes is None:
+            self._total_bytes = self._scan_size()
+        else:
+            self._total_bytes += len(data)
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        # (수정 시각, 크기, 경로) 목록
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".png"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        # 최대 크기의 90% 이하가 될 때까지 오래된 파일부터 삭제
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        limit = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._total_bytes = total
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "bytes": self._total_bytes}
+
+
+def default_cache():
+    # 환경 변수 QR_IMAGE_CACHE_DIR(위치), QR_IMAGE_CACHE_MB(최대 크기, 0 이면 캐시 사용 안 함)
+    max_mb = float(os.environ.get("QR_IMAGE_CACHE_MB", DEFAULT_MAX_MB))
+    if max_mb <= 0:
+        return None
+    try:
+        return QRImageCache(os.environ.get("QR_IMAGE_CACHE_DIR"), int(max_mb * 1024 * 1024))
+    except OSError as e:
+        print(f"QR image cache is not available: {e}")
+        return None
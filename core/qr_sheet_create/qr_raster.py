@@ -0,0 +1,80 @@
+import functools
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+# StyledPilImage + RoundedModuleDrawer 와 같은 이미지를 NumPy 로 한 번에 생성
+# - 모듈 1칸은 2x2 모서리 조각(corner_width = box_size // 2)으로 구성
+#   모서리 양쪽 이웃(예: 북서 모서리는 북/서)이 모두 비어 있으면 둥근 조각, 아니면 사각 조각
+# - 파인더 패턴(세 모서리의 7x7 눈)은 사각 모듈로 채움 (StyledPilImage 의 기본 eye drawer)
+# 모듈마다 PIL paste 를 호출하는 대신 조각 종류를 이웃 마스크로 한 번에 계산해 배열에 채움
+ANTIALIASING_FACTOR = 4 # qrcode 와 같은 값 (크게 그린 뒤 축소)
+EYE_SIZE = 7
+FRONT = 0 # 검정 모듈
+BACK = 255 # 흰 배경
+
+
+@functools.lru_cache(maxsize=16)
+def rounded_corner(corner_width):
+    # 북서 방향 둥근 모서리 조각 (qrcode RoundedModuleDrawer.setup_corners 와 같은 방법, 흑백(L) 배열)
+    fake_width = corner_width * ANTIALIASING_FACTOR
+    radius = fake_width
+    base = Image.new("L", (fake_width, fake_width), BACK)
+    base_draw = ImageDraw.Draw(base)
+    base_draw.ellipse((0, 0, radius * 2, radius * 2), fill=FRONT)
+    base_draw.rectangle((radius, 0, fake_width, fake_width), fill=FRONT)
+    base_draw.rectangle((0, radius, fake_width, fake_width), fill=FRONT)
+    corner = np.asarray(base.resize((corner_width, corner_width), Image.Resampling.LANCZOS))
+    corner.flags.writeable = False
+    return corner
+
+
+def eye_mask(size):
+    # 파인더 패턴 위치 (qrcode BaseImage.is_eye 와 동일)
+    mask = np.zeros((size, size), dtype=bool)
+    mask[:EYE_SIZE, :EYE_SIZE] = True
+    mask[:EYE_SIZE, size - EYE_SIZE:] = True
+    mask[size - EYE_SIZE:, :EYE_SIZE] = True
+    return mask
+
+
+def rasterize_modules(modules, box_size=10, border=4):
+    # 모듈 행렬(bool 2차원 배열) -> 흑백 이미지 배열 (uint8, 0=검정, 255=흰색)
+    modules = np.asarray(modules, dtype=bool)
+    size = modules.shape[0]
+    corner_width = box_size // 2
+    padded = np.pad(modules, 1)
+    north, south = padded[:-2, 1:-1], padded[2:, 1:-1]
+    west, east = padded[1:-1, :-2], padded[1:-1, 2:]
+    eyes = eye_mask(size)
+    rounded_modules = modules & ~eyes
+
+    canvas = np.full(((size + border * 2) * box_size,) * 2, BACK, dtype=np.uint8)
+    start, stop = border * box_size, (border + size) * box_size
+    # (모듈 행, 모듈 안 y, 모듈 열, 모듈 안 x) 형태의 뷰 - 조각을 모든 모듈에 한 번에 채움
+    grid = canvas[start:stop, start:stop].reshape(size, box_size, size, box_size)
+
+    corner = rounded_corner(corner_width)
+    quadrants = (
+        # (y 범위, x 범위, 둥근 모서리 조건, 조각 방향)
+        (slice(0, corner_width), slice(0, corner_width), ~north & ~west, corner),
+        (slice(0, corner_width), slice(corner_width, corner_width * 2), ~north & ~east, corner[:, ::-1]),
+        (slice(corner_width, corner_width * 2), slice(corner_width, corner_width * 2), ~south & ~east, corner[::-1, ::-1]),
+        (slice(corner_width, corner_width * 2), slice(0, corner_width), ~south & ~west, corner[::-1, :]),
+    )
+    for rows, cols, rounded, piece in quadrants:
+        square = np.where(rounded_modules & ~rounded, FRONT, BACK).astype(np.uint8)
+        grid[:, rows, :, cols] = np.where(
+            (rounded_modules & rounded)[:, None, :, None],
+            piece[None, :, None, :],
+            square[:, None, :, None],
+        )
+    # 파인더 패턴은 모듈 전체를 사각형으로 채움
+    eye_rows, eye_cols = np.nonzero(modules & eyes)
+    grid[eye_rows, :, eye_cols, :] = FRONT
+    return canvas
+
+
+def rasterize_qr(qr):
+    # make() 가 끝난 qrcode.QRCode -> 흑백(L) PIL 이미지
+    return Image.fromarray(rasterize_modules(qr.modules, qr.box_size, qr.border), "L")
@@ -0,0 +1,178 @@
+import functools
+import multiprocessing
+import os
+import sys
+from io import BytesIO
+
+import qrcode
+import qrcode.constants
+from qrcode.image.styledpil import StyledPilImage
+from qrcode.image.styles.moduledrawers.pil import RoundedModuleDrawer
+from PIL import Image, ImageDraw, ImageFont
+
+from core.qr_payload import encode_payload, is_compact, COMPACT
+from core.qr_sheet_create.qr_raster import rasterize_qr
+
+
+# 리소스 경로를 절대 경로로 반환
+def resource_path(relative_path):
+    try:
+        base_path = sys._MEIPASS # PyInstaller 로 패키징된 경우 사용하는 base_path
+    except AttributeError:
+        base_path = os.path.abspath('.') # 개발 중에서 사용하는 base_path
+    return os.path.join(base_path, relative_path)
+
+font_path = resource_path("meiryo.ttc")
+font_size = 35
+try:
+    font = ImageFont.truetype(font_path,font_size)
+    font_name = os.path.basename(font_path)
+except IOError:
+    font = ImageFont.load_default()
+    font_name = "default"
+
+# QR payload 형식 (compact: 짧은 버전 형식(기본값), json: 이전 리더용 JSON 형식)
+PAYLOAD_FORMAT = os.environ.get("QR_PAYLOAD_FORMAT", COMPACT)
+# compact 형식은 모듈 수가 적어 교수명 이미지가 차지하는 비율이 커지므로 오류 정정 수준을 높이고
+# 교수명 이미지를 QR 크기 대비 (가로, 세로) 비율 안으로 축소
+COMPACT_ERROR_CORRECTION = qrcode.constants.ERROR_CORRECT_H
+COMPACT_LABEL_RATIO = (0.35, 0.1)
+# QR 모듈 1칸의 픽셀 크기 - 고해상도(내보내기용, qrcode 기본값) / 엑셀에 삽입하는 이미지
+# 엑셀에는 표시 크기(50px)에 맞춰 작게 생성하되 메일로 보낸 이미지도 읽을 수 있도록 모듈당 4px 사용
+HIRES_BOX_SIZE = 10
+EMBED_BOX_SIZE = int(os.environ.get("QR_EMBED_BOX_SIZE", "4"))
+PALETTE_COLORS = 16 # 엑셀 삽입 이미지는 팔레트 PNG (흑백 + 안티에일리어싱 회색)
+# QR 이미지 생성 프로세스 수 (0 이면 CPU 수), 학생 수가 POOL_MIN_TASKS 미만이면 프로세스 풀 없이 생성
+RENDER_WORKERS = int(os.environ.get("QR_RENDER_WORKERS", "0"))
+POOL_MIN_TASKS = 32
+# QR 모듈 그리기 방식 (numpy: 배열로 한 번에 생성(기본값), pil: qrcode StyledPilImage 로 모듈마다 그리기) - 결과 이미지는 같음
+NUMPY_RASTERIZER = "numpy"
+PIL_RASTERIZER = "pil"
+RASTERIZER = os.environ.get("QR_RASTERIZER", NUMPY_RASTERIZER)
+
+
+def qr_payload(teacher_name, student_id, payload_format=None):
+    # QR 에 담을 내용 (학번, 담당교수) 직렬화(문자열로 변환)
+    return encode_payload(student_id, teacher_name, payload_format or PAYLOAD_FORMAT)
+
+
+def create_text_to_image(info):
+    # getbbox()를 사용하여 텍스트의 크기를 계산합니다.
+    bbox = font.getbbox(info)  # 텍스트 경계 상자의 크기
+    width, height = bbox[2] - bbox[0], bbox[3] - bbox[1]  # (좌, 상, 우, 하)의 차이를 이용해 너비와 높이 계산
+
+    # 텍스트를 담을 이미지를 생성합니다.
+    img = Image.new("RGB", (width + 20, height + 10), color="white")
+    draw = ImageDraw.Draw(img)
+
+    # 텍스트를 이미지에 그립니다.
+    draw.text((10, 0), info, font=font, fill="black")
+
+    return img
+
+
+def fit_label(label_image, qr_size, ratio=COMPACT_LABEL_RATIO):
+    # 교수명 이미지가 QR 크기 대비 ratio 보다 크면 비율을 유지하여 축소
+    scale = min(1.0, ratio[0] * qr_size[0] / label_image.size[0], ratio[1] * qr_size[1] / label_image.size[1])
+    if scale >= 1.0:
+        return label_image
+    return label_image.resize((max(1, int(label_image.size[0] * scale)), max(1, int(label_image.size[1] * scale))), Image.LANCZOS)
+
+
+def render_qr_image(payload, label_image=None, box_size=HIRES_BOX_SIZE, rasterizer=None):
+    # qr 코드 생성 (둥근 모듈), label_image(RGBA)가 있으면 QR 코드의 중앙에 삽입
+    # box_size 가 작으면 교수명 이미지도 같은 비율로 축소 (QR 대비 가리는 비율은 동일)
+    compact = is_compact(payload)
+    qr = qrcode.QRCode(error_correction=COMPACT_ERROR_CORRECTION if compact else qrcode.constants.ERROR_CORRECT_L, box_size=box_size)
+    qr.add_data(payload)
+    if (rasterizer or RASTERIZER) == PIL_RASTERIZER:
+        qr_image = qr.make_image(image_factory=StyledPilImage, module_drawer = RoundedModuleDrawer())
+    else:
+        qr.make()
+        qr_image = rasterize_qr(qr)
+    qr_image = qr_image.convert("RGBA")
+    if label_image is not None:
+        if box_size != HIRES_BOX_SIZE:
+            scale = box_size / HIRES_BOX_SIZE
+            label_image = label_image.resize((max(1, int(label_image.size[0] * scale)), max(1, int(label_image.size[1] * scale))), Image.LANCZOS)
+        if compact:
+            label_image = fit_label(label_image, qr_image.size)
+        qr_image.paste(label_image, ((qr_image.size[0] - label_image.size[0]) // 2, (qr_image.size[1] - label_image.size[1]) // 2), label_image)
+    return qr_image
+
+
+@functools.lru_cache(maxsize=256)
+def teacher_label(teacher_name):
+    # 교수별 QR 중앙 이미지(RGBA) - 교수마다 한 번만 생성 (프로세스별 캐시, 반환된 이미지는 수정하지 않음)
+    return create_text_to_image(str(teacher_name)).convert("RGBA")
+
+
+def render_params(payload, box_size=HIRES_BOX_SIZE, palette=False):
+    # 생성되는 이미지에 영향을 주는 렌더링 설정 (QR 이미지 캐시 키에 포함)
+    compact = is_compact(payload)
+    return {
+        "drawer": RoundedModuleDrawer.__name__,
+        "error_correction": COMPACT_ERROR_CORRECTION if compact else qrcode.constants.ERROR_CORRECT_L,
+        "box_size": box_size,
+        "border": 4,
+        "palette": PALETTE_COLORS if palette else None,
+        "label_ratio": COMPACT_LABEL_RATIO if compact else None,
+        "font": font_name,
+        "font_size": font_size,
+    }
+
+
+def render_qr_png(task, box_size=HIRES_BOX_SIZE, palette=False):
+    # (payload, 교수명) -> QR PNG bytes (프로세스 풀 작업 단위)
+    payload, label_text = task
+    label_image = teacher_label(label_text) if label_text is not None else None
+    qr_image = render_qr_image(payload, label_image, box_size)
+    # QR 코드를 이미지로 변환하여 BytesIO로 저장 (palette=True 이면 팔레트 PNG 로 용량 축소)
+    img_byte_arr = BytesIO()
+    if palette:
+        qr_image.convert("RGB").quantize(colors=PALETTE_COLORS).save(img_byte_arr, "PNG", optimize=True)
+    else:
+        qr_image.save(img_byte_arr, "PNG")
+    return img_byte_arr.getvalue()
+
+
+def render_qr_pngs(tasks, workers=None, progress=None, chunksize=4, cache=None, box_size=EMBED_BOX_SIZE, palette=True):
+    # QR 생성과 PNG 인코딩을 여러 프로세스에서 처리하고 입력 순서(행 순서)대로 반환
+    # 기본값은 엑셀 삽입용(작은 팔레트 PNG), 고해상도는 box_size=HIRES_BOX_SIZE, palette=False
+    # cache(QRImageCache) 가 있으면 캐시에 없는 QR 만 생성, progress(완료 수, 전체 수) 로 진행 상황 전달
+    tasks = list(tasks)
+    render = functools.partial(render_qr_png, box_size=box_size, palette=palette)
+    pngs = [None] * len(tasks)
+    keys = [None] * len(tasks)
+    missing = []
+    for i, (payload, label_text) in enumerate(tasks):
+        if cache is not None:
+            keys[i] = cache.key(payload, label_text, render_params(payload, box_size, palette))
+            pngs[i] = cache.get(keys[i])
+        if pngs[i] is None:
+            missing.append(i)
+    done = len(tasks) - len(missing)
+    if progress is not None and done:
+        progress(done, len(tasks))
+
+    workers = workers or RENDER_WORKERS or os.cpu_count() or 1
+    missing_tasks = [tasks[i] for i in missing]
+    if workers <= 1 or len(missing) < POOL_MIN_TASKS:
+        results = map(render, missing_tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(min(workers, len(missing)))
+        results = pool.imap(render, missing_tasks, chunksize)
+    try:
+        for i, png in zip(missing, results):
+            pngs[i] = png
+            if cache is not None:
+                cache.put(keys[i], png)
+            done += 1
+            if progress is not None:
+                progress(done, len(tasks))
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    return pngs
@@ -0,0 +1,147 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+import qrcode
+from qrcode.image.styledpil import StyledPilImage
+from qrcode.image.styles.moduledrawers.pil import RoundedModuleDrawer
+
+from core.qr_payload import COMPACT, LEGACY_JSON, is_compact
+from core.qr_sheet_create.qr_raster import rasterize_qr
+from core.qr_sheet_create.qr_render import (
+    qr_payload, teacher_label, render_qr_image, render_qr_png,
+    NUMPY_RASTERIZER, PIL_RASTERIZER, EMBED_BOX_SIZE, HIRES_BOX_SIZE, COMPACT_ERROR_CORRECTION,
+)
+import core.qr_sheet_create.qr_render as qr_render
+
+
+# QR 이미지 생성 벤치마크 - NumPy 래스터라이저와 qrcode StyledPilImage 의 결과 비교(픽셀 단위) 및 속도 측정
+
+
+def make_tasks(students, teachers, payload_format):
+    # 출석부와 같은 (payload, 교수명) 목록
+    tasks = []
+    for i in range(students):
+        teacher = f"教員{i % teachers}"
+        tasks.append((qr_payload(teacher, f"S{i:06d}", payload_format), teacher))
+    return tasks
+
+
+def compare(tasks, box_size):
+    # 두 방식의 이미지(교수명 포함)가 같은지 확인 -> (다른 이미지 수, 최대 픽셀 차이)
+    mismatches = 0
+    max_diff = 0
+    for payload, teacher in tasks:
+        label = teacher_label(teacher)
+        expected = np.asarray(render_qr_image(payload, label, box_size, PIL_RASTERIZER))
+        actual = np.asarray(render_qr_image(payload, label, box_size, NUMPY_RASTERIZER))
+        if expected.shape != actual.shape:
+            mismatches += 1
+            continue
+        diff = int(np.abs(expected.astype(np.int16) - actual.astype(np.int16)).max())
+        if diff:
+            mismatches += 1
+            max_diff = max(max_diff, diff)
+    return mismatches, max_diff
+
+
+def time_raster(tasks, box_size):
+    # 모듈 그리기만 측정 (QR 인코딩/마스크 선택은 제외) -> (StyledPilImage ms, NumPy ms)
+    qrs = []
+    for payload, _ in tasks:
+        qr = qrcode.QRCode(error_correction=COMPACT_ERROR_CORRECTION if is_compact(payload) else qrcode.constants.ERROR_CORRECT_L, box_size=box_size)
+        qr.add_data(payload)
+        qr.make()
+        qrs.append(qr)
+    start = time.perf_counter()
+    for qr in qrs:
+        qr.make_image(image_factory=StyledPilImage, module_drawer=RoundedModuleDrawer())
+    pil_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    for qr in qrs:
+        rasterize_qr(qr)
+    numpy_elapsed = time.perf_counter() - start
+    count = max(1, len(qrs))
+    return pil_elapsed * 1000 / count, numpy_elapsed * 1000 / count
+
+
+def time_render(tasks, box_size, rasterizer, png, palette):
+    # 이미지 1장당 평균 시간(ms) - png 이면 PNG 인코딩까지 포함 (render_qr_pngs 작업 단위)
+    previous = qr_render.RASTERIZER
+    qr_render.RASTERIZER = rasterizer
+    try:
+        start = time.perf_counter()
+        for payload, teacher in tasks:
+            if png:
+                render_qr_png((payload, teacher), box_size, palette)
+            else:
+                render_qr_image(payload, teacher_label(teacher), box_size, rasterizer)
+        elapsed = time.perf_counter() - start
+    finally:
+        qr_render.RASTERIZER = previous
+    return elapsed * 1000 / max(1, len(tasks))
+
+
+def run_benchmark(students=200, teachers=5, payload_format=COMPACT, box_sizes=(EMBED_BOX_SIZE, HIRES_BOX_SIZE), compare_count=50):
+    tasks = make_tasks(students, teachers, payload_format)
+    for _, teacher in tasks:
+        teacher_label(teacher) # 교수명 이미지는 미리 생성 (측정에서 제외)
+    result = {"students": students, "payload_format": payload_format, "box_sizes": {}}
+    for box_size in box_sizes:
+        mismatches, max_diff = compare(tasks[:compare_count], box_size)
+        palette = box_size != HIRES_BOX_SIZE
+        entry = {"compared": min(compare_count, len(tasks)), "mismatches": mismatches, "max_pixel_diff": max_diff}
+        entry["pil_raster_ms"], entry["numpy_raster_ms"] = time_raster(tasks, box_size)
+        for rasterizer in (PIL_RASTERIZER, NUMPY_RASTERIZER):
+            entry[f"{rasterizer}_image_ms"] = time_render(tasks, box_size, rasterizer, False, palette)
+            entry[f"{rasterizer}_png_ms"] = time_render(tasks, box_size, rasterizer, True, palette)
+        entry["raster_speedup"] = entry["pil_raster_ms"] / entry["numpy_raster_ms"]
+        entry["image_speedup"] = entry["pil_image_ms"] / entry["numpy_image_ms"]
+        entry["png_speedup"] = entry["pil_png_ms"] / entry["numpy_png_ms"]
+        result["box_sizes"][box_size] = entry
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="QR image rendering benchmark (NumPy rasterizer vs qrcode StyledPilImage)")
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--teachers", type=int, default=5)
+    parser.add_argument("--payload-format", default=COMPACT, choices=[COMPACT, LEGACY_JSON])
+    parser.add_argument("--box-sizes", type=int, nargs="+", default=[EMBED_BOX_SIZE, HIRES_BOX_SIZE])
+    parser.add_argument("--compare", type=int, default=50, help="number of images compared pixel by pixel")
+    parser.add_argument("--json", help="write results to this file")
+    # CI 기준값 (지정한 경우만 확인)
+    parser.add_argument("--min-speedup", type=float, help="minimum module drawing (raster) speedup")
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(args.students, args.teachers, args.payload_format, args.box_sizes, args.compare)
+    # 시간은 이미지 1장당 ms (raster: 모듈 그리기만, image: QR 인코딩 + 교수명 포함, png: PNG 인코딩까지)
+    print(f"{'box':>4}{'compared':>10}{'mismatch':>10}{'stage':>8}{'pil ms':>10}{'numpy ms':>10}{'speedup':>9}")
+    for box_size, entry in result["box_sizes"].items():
+        for stage in ("raster", "image", "png"):
+            print(
+                f"{box_size:>4}{entry['compared']:>10}{entry['mismatches']:>10}{stage:>8}"
+                f"{entry[f'pil_{stage}_ms']:>10.2f}{entry[f'numpy_{stage}_ms']:>10.2f}{entry[f'{stage}_speedup']:>8.1f}x"
+            )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    failures = []
+    for box_size, entry in result["box_sizes"].items():
+        if entry["mismatches"]:
+            failures.append(f"box {box_size}: {entry['mismatches']} images differ (max pixel diff {entry['max_pixel_diff']})")
+        if args.min_speedup is not None and entry["raster_speedup"] < args.min_speedup:
+            failures.append(f"box {box_size}: raster speedup {entry['raster_speedup']:.1f}x < {args.min_speedup}x")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+import threading
+import time
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from core.qr_sheet_create.workbook_builder import build_seperate_workbook
+from core.qr_sheet_create.seperate_update import update_seperate_workbook
+
+# 진행 상황 시그널 최소 간격(초) - 단계가 바뀌거나 마지막 항목이면 바로 전달
+PROGRESS_INTERVAL = 0.1
+
+
+class JobCancelled(Exception):
+    pass
+
+
+# SEPERATE 파일 생성을 백그라운드 스레드에서 실행 (QR 생성은 다시 프로세스 풀에서 처리)
+# 메인 스레드는 시그널만 받아 화면을 갱신하므로 큰 명단에서도 GUI 가 멈추지 않음
+class SeperateJob(QThread):
+    # 단계(workbook_builder.STAGE_*), 완료 수, 전체 수(0 이면 알 수 없음), 남은 시간(초, 모르면 -1)
+    progressChanged = pyqtSignal(str, int, int, float)
+    succeeded = pyqtSignal(str, dict) # 생성된 파일 경로, 변경 요약 (갱신 작업만)
+    failed = pyqtSignal(str) # 오류 메시지
+    cancelled = pyqtSignal()
+
+    def __init__(self, source_path, output_path, cache=None, export_dir=None, workers=None, parent=None):
+        super().__init__(parent)
+        self.source_path = source_path
+        self.output_path = output_path
+        self.cache = cache
+        self.export_dir = export_dir
+        self.workers = workers
+        self._cancel = threading.Event()
+        self._stage = None
+        self._stage_start = 0.0 # 단계의 첫 진행 보고 시각과 완료 수 (캐시 적중분은 속도 계산에서 제외)
+        self._stage_first_done = 0
+        self._last_emit = 0.0
+
+    def cancel(self):
+        # 취소 요청 - 다음 진행 보고 시점에 작업 중단 (저장 전이면 파일은 만들어지지 않음)
+        self._cancel.set()
+
+    def is_cancelled(self):
+        return self._cancel.is_set()
+
+    def eta(self, done, total, now):
+        # 현재 단계의 처리 속도로 남은 시간 추정
+        processed = done - self._stage_first_done
+        elapsed = now - self._stage_start
+        if total <= 0 or processed <= 0 or elapsed <= 0:
+            return -1.0
+        return (total - done) * elapsed / processed
+
+    def report(self, stage, done, total):
+        # build_seperate_workbook 의 progress 콜백 (작업 스레드에서 호출)
+        if self._cancel.is_set():
+            raise JobCancelled()
+        now = time.monotonic()
+        if stage != self._stage:
+            self._stage = stage
+            self._stage_start = now
+            self._stage_first_done = done
+        elif now - self._last_emit < PROGRESS_INTERVAL and done != total:
+            return
+        self._last_emit = now
+        self.progressChanged.emit(stage, done, total, self.eta(done, total, now))
+
+    def execute(self):
+        # 작업 실행 -> 변경 요약(dict), 원본에 出席調査 시트가 없으면 None
+        created = build_seperate_workbook(
+            self.source_path, self.output_path, progress=self.report,
+            cache=self.cache, workers=self.workers, export_dir=self.export_dir,
+        )
+        return {} if created else None
+
+    def run(self):
+        try:
+            summary = self.execute()
+        except JobCancelled:
+            self.cancelled.emit()
+            return
+        except Exception as e:
+            print(f"Error creating SEPERATE file: {e}")
+            self.failed.emit(str(e))
+            return
+        if summary is None:
+            self.failed.emit("出席調査 という名のシートがありません。")
+            return
+        self.succeeded.emit(self.output_path, summary)
+
+
+# 기존 SEPERATE 파일(output_path)을 새 원본 명단으로 갱신 (출석 기록 유지)
+class SeperateUpdateJob(SeperateJob):
+    def execute(self):
+        return update_seperate_workbook(
+            self.source_path, self.output_path, progress=self.report,
+            cache=self.cache, workers=self.workers, export_dir=self.export_dir,
+        )
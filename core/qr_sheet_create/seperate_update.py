@@ -0,0 +1,149 @@
+import numpy as np
+import openpyxl
+import pandas as pd
+from openpyxl.utils import get_column_letter
+
+from core.qr_reader.roster import normalize_ids, CLASS_COUNT, ABSENT_COUNT
+from core.qr_sheet_create.qr_render import render_qr_pngs
+from core.qr_sheet_create.workbook_builder import (
+    ATTENDANCE_SHEET, QR_SHEET, CLASS_COLUMN, STUDENT_ID_COLUMN, STUDENT_COLUMNS,
+    STAGE_ROWS, STAGE_QR, STAGE_EXPORT, STAGE_SAVE,
+    read_sheet, write_sheet, class_sheets, student_sheet, qr_tasks, add_qr_images, export_qr_images, save_workbook,
+)
+
+# 학기 중 명단이 바뀌었을 때 기존 SEPERATE 파일을 갱신 (처음부터 다시 생성하지 않음)
+# - 과목 시트: 学籍番号 기준으로 빠진 학생 행은 삭제, 새 학생은 끝에 추가 (기존 행의 出席時間/授業回数 등은 그대로 유지)
+#   학생 구성이 바뀌지 않은 과목 시트는 수정하지 않고, 새 과목은 시트를 추가, 명단에서 빠진 과목 시트는 삭제하지 않음
+# - QR 시트: 새 명단으로 다시 작성하되 기존 QR 이미지는 그대로 사용 (새 학번/교수가 바뀐 학생만 QR 생성)
+# - 出席調査 시트: 새 명단으로 교체하고 授業回数/欠席数 는 기존 값 유지 (学籍番号 + クラス名 기준)
+KEEP_COLUMNS = [CLASS_COUNT, ABSENT_COUNT]
+
+
+def replace_sheet(wb, title, df: pd.DataFrame):
+    # 같은 위치에 시트를 새로 작성 (없으면 끝에 추가)
+    index = None
+    if title in wb.sheetnames:
+        index = wb.sheetnames.index(title)
+        wb.remove(wb[title])
+    worksheet = wb.create_sheet(title=title, index=index)
+    write_sheet(worksheet, df)
+    return worksheet
+
+
+def diff_class_sheet(existing: pd.DataFrame, group: pd.DataFrame):
+    # (갱신된 과목 시트 또는 변경이 없으면 None, 추가 수, 삭제 수)
+    existing_ids = normalize_ids(existing[STUDENT_ID_COLUMN])
+    new_ids = normalize_ids(group[STUDENT_ID_COLUMN])
+    keep = existing_ids.isin(set(new_ids)).to_numpy()
+    added = group[~new_ids.isin(set(existing_ids)).to_numpy()]
+    removed = int((~keep).sum())
+    if not removed and added.empty:
+        return None, 0, 0
+    # object 로 합쳐 기존 값의 형식(정수 등)이 바뀌지 않도록 함
+    updated = pd.concat([existing[keep].astype(object), added.reindex(columns=existing.columns).astype(object)], ignore_index=True)
+    return updated, len(added), removed
+
+
+def carry_over_counts(df_new: pd.DataFrame, df_old: pd.DataFrame) -> pd.DataFrame:
+    # 새 명단에 기존 出席調査 시트의 授業回数/欠席数 반영 (같은 学籍番号 + クラス名 의 첫 번째 행 값)
+    columns = [column for column in KEEP_COLUMNS if column in df_new.columns and column in df_old.columns]
+    if not columns or df_old.empty or df_new.empty:
+        return df_new
+    old_keys = pd.MultiIndex.from_arrays([normalize_ids(df_old[STUDENT_ID_COLUMN]), normalize_ids(df_old[CLASS_COLUMN])])
+    new_keys = pd.MultiIndex.from_arrays([normalize_ids(df_new[STUDENT_ID_COLUMN]), normalize_ids(df_new[CLASS_COLUMN])])
+    first = ~old_keys.duplicated(keep='first')
+    positions = old_keys[first].get_indexer(new_keys)
+    matched = np.flatnonzero(positions >= 0)
+    df_new = df_new.copy()
+    for column in columns:
+        df_new[column] = df_new[column].astype(object)
+        df_new.iloc[matched, df_new.columns.get_loc(column)] = df_old[column].to_numpy()[first][positions[matched]]
+    return df_new
+
+
+def same_students(df_students: pd.DataFrame, old_qr: pd.DataFrame) -> bool:
+    # QR 시트의 학생 정보(순서 포함)가 바뀌지 않았는지 확인
+    if list(old_qr.columns[:len(STUDENT_COLUMNS)]) != STUDENT_COLUMNS or len(old_qr) != len(df_students):
+        return False
+    return df_students[STUDENT_COLUMNS].reset_index(drop=True).equals(old_qr[STUDENT_COLUMNS].reset_index(drop=True))
+
+
+def existing_qr_images(worksheet, df_qr: pd.DataFrame):
+    # 기존 QR 시트의 payload -> PNG bytes (이미지는 학생 행에 고정되어 있음)
+    images = {image.anchor._from.row: image for image in worksheet._images} # 0부터 시작하는 행 번호 (헤더가 0)
+    pngs = {}
+    for row, (payload, _) in enumerate(qr_tasks(df_qr), start=1):
+        image = images.get(row)
+        if image is not None:
+            pngs[payload] = image._data()
+    return pngs
+
+
+def update_seperate_workbook(source_path, seperate_path, progress=None, cache=None, workers=None, export_dir=None):
+    # 새 원본 파일(出席調査)로 기존 SEPERATE 파일 갱신 -> 변경 요약(dict), 원본에 出席調査 시트가 없으면 None
+    # progress(단계, 완료 수, 전체 수) 로 진행 상황 전달 (예외를 발생시키면 작업 중단), export_dir 에는 새로 생성한 QR 만 저장
+    def report(stage):
+        if progress is None:
+            return None
+        return lambda done, total=0: progress(stage, done, total)
+
+    source = openpyxl.load_workbook(source_path, read_only=True)
+    try:
+        if ATTENDANCE_SHEET not in source.sheetnames:
+            return None
+        df_new = read_sheet(source[ATTENDANCE_SHEET])
+    finally:
+        source.close()
+
+    wb = openpyxl.load_workbook(seperate_path)
+    if QR_SHEET not in wb.sheetnames:
+        raise ValueError(f"'{QR_SHEET}' sheet not found in {seperate_path}")
+    df_old = read_sheet(wb[ATTENDANCE_SHEET]) if ATTENDANCE_SHEET in wb.sheetnames else pd.DataFrame()
+    summary = {"added": 0, "removed": 0, "new_classes": [], "updated_classes": [], "dropped_classes": [], "rendered": 0}
+
+    # 과목 시트
+    rows_done = 0
+    classes = set()
+    for name, group in class_sheets(df_new):
+        classes.add(name)
+        if name in (ATTENDANCE_SHEET, QR_SHEET):
+            raise ValueError(f"Sheet '{name}' already exists")
+        if name not in wb.sheetnames:
+            write_sheet(wb.create_sheet(title=name, index=wb.sheetnames.index(QR_SHEET)), group) # 새 과목 시트는 QR 시트 앞에 추가
+            summary["new_classes"].append(name)
+            summary["added"] += len(group)
+        else:
+            updated, added, removed = diff_class_sheet(read_sheet(wb[name]), group)
+            if updated is not None:
+                replace_sheet(wb, name, updated)
+                summary["updated_classes"].append(name)
+                summary["added"] += added
+                summary["removed"] += removed
+        rows_done += len(group)
+        if progress is not None:
+            progress(STAGE_ROWS, rows_done, len(df_new))
+    if CLASS_COLUMN in df_old.columns:
+        summary["dropped_classes"] = sorted(
+            str(name) for name in df_old[CLASS_COLUMN].dropna().unique() if str(name) not in classes and str(name) in wb.sheetnames
+        )
+
+    # QR 시트 - 기존 이미지를 재사용하고 없는 것만 생성
+    df_students = student_sheet(df_new)
+    tasks = qr_tasks(df_students)
+    old_qr = read_sheet(wb[QR_SHEET])
+    if not same_students(df_students, old_qr):
+        pngs = existing_qr_images(wb[QR_SHEET], old_qr) if set(STUDENT_COLUMNS) <= set(old_qr.columns) else {}
+        missing = [i for i, (payload, _) in enumerate(tasks) if payload not in pngs]
+        rendered = render_qr_pngs([tasks[i] for i in missing], workers=workers, progress=report(STAGE_QR), cache=cache)
+        rendered = dict(zip(missing, rendered))
+        qr_sheet = replace_sheet(wb, QR_SHEET, df_students)
+        add_qr_images(qr_sheet, [rendered[i] if i in rendered else pngs[payload] for i, (payload, _) in enumerate(tasks)], get_column_letter(len(STUDENT_COLUMNS) + 1))
+        summary["rendered"] = len(missing)
+        if export_dir and missing:
+            export_qr_images(df_students[STUDENT_ID_COLUMN].iloc[missing], [tasks[i] for i in missing], export_dir, report(STAGE_EXPORT), cache, workers)
+
+    # 出席調査 시트
+    replace_sheet(wb, ATTENDANCE_SHEET, carry_over_counts(df_new, df_old))
+
+    save_workbook(wb, seperate_path, report(STAGE_SAVE))
+    return summary
@@ -0,0 +1,382 @@
+import os
+import re
+import tempfile
+from io import BytesIO
+from itertools import islice
+
+import openpyxl
+import openpyxl.drawing.image
+import pandas as pd
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+from openpyxl.utils import get_column_letter
+
+from core.qr_sheet_create.qr_render import qr_payload, render_qr_pngs, HIRES_BOX_SIZE
+
+# SEPERATE 파일 구성
+ATTENDANCE_SHEET = "出席調査" # 원본 종합 출결 시트
+QR_SHEET = "QR"
+CLASS_COLUMN = "クラス名" # 과목 시트 분리 기준
+STUDENT_ID_COLUMN = "学籍番号"
+TEACHER_COLUMN = "担当教員名"
+ATTEND_TIME_COLUMN = "出席時間" # 과목 시트에 추가하는 출석 시간 열
+DROP_COLUMNS = ["@std.nagaokauniv.ac.jp"] # 과목 시트에서 제외하는 열
+STUDENT_COLUMNS = ["担当教員名", "学年", "学籍番号", "氏名", "カナ", "学生メールアドレス"] # QR 시트 열
+QR_COLUMN = "QR"
+QR_IMAGE_SIZE = 50 # QR 시트에 표시되는 이미지 크기(px)
+# 出席調査 시트 행 수가 이 값 이상이면 스트리밍(write-only) 방식으로 저장 (환경 변수 SEPERATE_STREAMING_ROWS)
+STREAMING_ROW_THRESHOLD = int(os.environ.get("SEPERATE_STREAMING_ROWS", 10000))
+RENDER_CHUNK_SIZE = 2000 # 고해상도 QR 이미지(스트리밍 방식은 삽입 이미지도)는 이 개수씩 생성해 바로 저장 (메모리 사용량 제한)
+
+# 진행 상황 단계 - progress(단계, 완료 수, 전체 수) 로 전달 (전체 수 0 은 알 수 없음)
+STAGE_COPY = "copy" # 원본 시트 복사 (스트리밍 방식)
+STAGE_ROWS = "rows" # 시트 행 기록
+STAGE_QR = "qr" # QR 이미지 생성
+STAGE_EXPORT = "export" # 고해상도 QR 이미지 저장
+STAGE_SAVE = "save" # 엑셀 파일 저장 (기록한 바이트 수)
+ROW_REPORT_INTERVAL = 200
+
+# pandas to_excel 과 같은 헤더 서식
+_thin = Side(style="thin")
+HEADER_FONT = Font(bold=True)
+HEADER_BORDER = Border(left=_thin, right=_thin, top=_thin, bottom=_thin)
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="top")
+
+
+def trim_blank_rows(rows):
+    # 끝부분의 빈 행을 제외하고 전달 (빈 행은 값이 있는 행이 다시 나올 때까지 보류)
+    pending = []
+    for row in rows:
+        if all(value is None for value in row):
+            pending.append(row)
+            continue
+        yield from pending
+        pending = []
+        yield row
+
+
+def rows_to_frame(rows) -> pd.DataFrame:
+    # 첫 행은 헤더, 끝부분의 빈 행은 제외
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        return pd.DataFrame()
+    return pd.DataFrame(list(trim_blank_rows(rows)), columns=list(header))
+
+
+def read_sheet(worksheet) -> pd.DataFrame:
+    # 이미 열린 워크시트를 DataFrame 으로 변환 (파일을 다시 읽지 않음)
+    return rows_to_frame(worksheet.iter_rows(values_only=True))
+
+
+def copy_rows(rows, target, on_rows=None):
+    # 행을 target 시트에 값만 복사하면서 그대로 전달 (스트리밍 방식), on_rows(복사한 행 수) 로 진행 상황 전달
+    count = 0
+    for row in rows:
+        target.append(row)
+        yield row
+        count += 1
+        if on_rows is not None and count == ROW_REPORT_INTERVAL:
+            on_rows(count)
+            count = 0
+    if on_rows is not None and count:
+        on_rows(count)
+
+
+def copy_sheet(source, target, on_rows=None):
+    # 원본 시트를 값만 복사 (스트리밍 방식)
+    for _ in copy_rows(source.iter_rows(values_only=True), target, on_rows):
+        pass
+
+
+def write_header(worksheet, columns):
+    # 서식을 지정한 헤더 셀 추가 (일반/write-only 워크시트 모두 사용 가능)
+    header = []
+    for column in columns:
+        cell = WriteOnlyCell(worksheet, value=column)
+        cell.font = HEADER_FONT
+        cell.border = HEADER_BORDER
+        cell.alignment = HEADER_ALIGNMENT
+        header.append(cell)
+    worksheet.append(header)
+
+
+def write_sheet(worksheet, df: pd.DataFrame, on_rows=None):
+    # DataFrame 을 워크시트에 기록 (헤더 + 값, 빈 값(NaN/NA)은 빈 셀), on_rows(기록한 행 수) 로 진행 상황 전달
+    write_header(worksheet, df.columns)
+    values = df.astype(object).where(df.notna(), None)
+    count = 0
+    for row in values.itertuples(index=False, name=None):
+        worksheet.append(row)
+        count += 1
+        if on_rows is not None and count == ROW_REPORT_INTERVAL:
+            on_rows(count)
+            count = 0
+    if on_rows is not None and count:
+        on_rows(count)
+
+
+class _ProgressWriter:
+    # 저장되는 바이트 수를 세는 파일 래퍼
+    def __init__(self, file, callback):
+        self._file = file
+        self._callback = callback
+        self.written = 0
+
+    def write(self, data):
+        result = self._file.write(data)
+        self.written += len(data)
+        self._callback(self.written)
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+def save_workbook(wb, output_path, on_bytes=None):
+    # 임시 파일에 저장한 뒤 교체 (중간에 취소/실패해도 기존 파일이 깨지지 않음)
+    tmp_path = output_path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            wb.save(_ProgressWriter(f, on_bytes) if on_bytes is not None else f)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def class_sheets(df: pd.DataFrame):
+    # (과목명, 과목 시트 DataFrame) - 메일 주소 열 제외, 출석 시간 열 추가
+    for name, group in df.groupby(CLASS_COLUMN):
+        group = group.drop(columns=[column for column in DROP_COLUMNS if column in group.columns])
+        group[ATTEND_TIME_COLUMN] = None
+        yield str(name), group
+
+
+def student_sheet(df: pd.DataFrame) -> pd.DataFrame:
+    # QR 시트 - 학번 기준으로 중복 제거한 학생 정보
+    df_students = df[STUDENT_COLUMNS].drop_duplicates(subset=STUDENT_ID_COLUMN)
+    df_students[QR_COLUMN] = None
+    return df_students
+
+
+def qr_tasks(df_students: pd.DataFrame):
+    # (payload, 교수명) - 각 QR 중앙에는 해당 학생의 담당교수명 표시
+    return list(zip(
+        (qr_payload(teacher, student_id) for teacher, student_id in zip(df_students[TEACHER_COLUMN], df_students[STUDENT_ID_COLUMN])),
+        df_students[TEACHER_COLUMN],
+    ))
+
+
+def add_qr_images(worksheet, qr_pngs, column):
+    # QR 이미지를 학생 행 순서대로 QR 열에 삽입
+    for row_num, qr_png in enumerate(qr_pngs, start=2): # 데이터는 첫 번째 행에 헤더가 있으므로 두 번째 행부터 시작
+        img = openpyxl.drawing.image.Image(BytesIO(qr_png))
+        img.width = QR_IMAGE_SIZE
+        img.height = QR_IMAGE_SIZE
+        worksheet.add_image(img, f"{column}{row_num}")
+
+
+def render_in_chunks(tasks, progress=None, **render_args):
+    # RENDER_CHUNK_SIZE 개씩 생성 -> (작업 순번, PNG bytes), progress(완료 수, 전체 수)
+    for start in range(0, len(tasks), RENDER_CHUNK_SIZE):
+        chunk_progress = None
+        if progress is not None:
+            chunk_progress = lambda done, total, start=start: progress(start + done, len(tasks))
+        qr_pngs = render_qr_pngs(tasks[start:start + RENDER_CHUNK_SIZE], progress=chunk_progress, **render_args)
+        yield from enumerate(qr_pngs, start=start)
+
+
+def add_qr_image_files(worksheet, tasks, column, image_dir, progress=None, cache=None, workers=None):
+    # 대용량 명단용 - QR 이미지를 image_dir 에 저장하고 파일 경로로 삽입
+    # 이미지 데이터는 엑셀 파일을 저장할 때 파일에서 읽으므로 PNG 를 메모리에 모아 두지 않음
+    for i, qr_png in render_in_chunks(tasks, progress, workers=workers, cache=cache):
+        path = os.path.join(image_dir, f"{i}.png")
+        with open(path, "wb") as f:
+            f.write(qr_png)
+        img = openpyxl.drawing.image.Image(path)
+        img.width = QR_IMAGE_SIZE
+        img.height = QR_IMAGE_SIZE
+        worksheet.add_image(img, f"{column}{i + 2}")
+
+
+def export_qr_images(student_ids, tasks, export_dir, progress=None, cache=None, workers=None):
+    # 인쇄 등을 위한 고해상도 QR 이미지를 <学籍番号>.png 로 저장, progress(완료 수, 전체 수)
+    # 이미지가 크므로 RENDER_CHUNK_SIZE 개씩 생성해 바로 저장
+    os.makedirs(export_dir, exist_ok=True)
+    student_ids = list(student_ids)
+    for i, qr_png in render_in_chunks(tasks, progress, workers=workers, cache=cache, box_size=HIRES_BOX_SIZE, palette=False):
+        file_name = re.sub(r'[\\/:*?"<>|]', "_", str(student_ids[i])) + ".png"
+        with open(os.path.join(export_dir, file_name), "wb") as f:
+            f.write(qr_png)
+
+
+def sheet_row_count(worksheet, limit=None):
+    # read-only 워크시트의 행 수 (dimension 정보가 없는 파일은 limit 행까지만 직접 셈)
+    if worksheet.max_row is not None:
+        return worksheet.max_row
+    return sum(1 for _ in islice(worksheet.iter_rows(values_only=True), limit))
+
+
+def _row_counter(progress, stage, total):
+    # on_rows 콜백 - 누적 행 수를 progress(단계, 완료 수, 전체 수) 로 전달
+    done = 0
+    def on_rows(count):
+        nonlocal done
+        done += count
+        if progress is not None:
+            progress(stage, done, total)
+    return on_rows
+
+
+def _add_seperate_sheets(wb, df, sheet_names, progress, cache, workers, export_dir):
+    # 과목 시트, QR 시트, QR 이미지 추가 (일반/write-only 워크북 공통)
+    def report(stage):
+        if progress is None:
+            return None
+        return lambda done, total=0: progress(stage, done, total)
+
+    df_students = student_sheet(df)
+    on_rows = _row_counter(progress, STAGE_ROWS, len(df) + len(df_students))
+    for name, group in class_sheets(df):
+        if name in sheet_names:
+            raise ValueError(f"Sheet '{name}' already exists")
+        write_sheet(wb.create_sheet(title=name), group, on_rows)
+
+    qr_sheet = wb.create_sheet(title=QR_SHEET)
+    write_sheet(qr_sheet, df_students, on_rows)
+    tasks = qr_tasks(df_students)
+    qr_pngs = render_qr_pngs(tasks, workers=workers, progress=report(STAGE_QR), cache=cache)
+    add_qr_images(qr_sheet, qr_pngs, get_column_letter(len(STUDENT_COLUMNS) + 1))
+    del qr_pngs
+    if export_dir:
+        export_qr_images(df_students[STUDENT_ID_COLUMN], tasks, export_dir, report(STAGE_EXPORT), cache, workers)
+
+
+def _save_report(progress):
+    if progress is None:
+        return None
+    return lambda written: progress(STAGE_SAVE, written, 0)
+
+
+def build_seperate_workbook(source_path, output_path, progress=None, cache=None, workers=None, export_dir=None, streaming=None):
+    # 원본 파일을 한 번만 읽고(원본 시트 유지) 과목 시트, QR 시트, QR 이미지를 메모리에서 구성한 뒤 한 번만 저장
+    # QR 시트에는 표시 크기에 맞춘 작은 이미지를 삽입, export_dir 를 지정하면 고해상도 이미지를 따로 저장
+    # progress(단계, 완료 수, 전체 수) 로 진행 상황 전달 (예외를 발생시키면 작업 중단), 出席調査 시트가 없으면 False
+    # streaming=None 이면 出席調査 행 수가 STREAMING_ROW_THRESHOLD 이상일 때 스트리밍 방식 사용
+    source = openpyxl.load_workbook(source_path, read_only=True)
+    try:
+        if ATTENDANCE_SHEET not in source.sheetnames:
+            return False
+        if streaming is None:
+            streaming = sheet_row_count(source[ATTENDANCE_SHEET], STREAMING_ROW_THRESHOLD) >= STREAMING_ROW_THRESHOLD
+        if streaming:
+            build_streaming_workbook(source, output_path, progress, cache, workers, export_dir)
+            return True
+    finally:
+        source.close()
+
+    wb = openpyxl.load_workbook(source_path)
+    df = read_sheet(wb[ATTENDANCE_SHEET])
+    _add_seperate_sheets(wb, df, wb.sheetnames, progress, cache, workers, export_dir)
+    save_workbook(wb, output_path, _save_report(progress))
+    return True
+
+
+def sort_class_names(names):
+    # 과목 시트 순서 (groupby 와 같은 정렬 순서)
+    try:
+        return sorted(names)
+    except TypeError: # 숫자와 문자열이 섞인 경우
+        return sorted(names, key=str)
+
+
+def build_streaming_workbook(source, output_path, progress=None, cache=None, workers=None, export_dir=None):
+    # 대용량 명단용 - 원본(read-only)에서 한 행씩 읽어 write-only 워크북에 바로 기록
+    # 出席調査 시트는 한 번만 읽으며 복사와 동시에 과목 시트, QR 시트(학번 기준 첫 행)에 행 단위로 나누어 기록 (DataFrame 을 만들지 않음)
+    # 행은 기록 즉시 임시 파일로 내보내고, QR 이미지는 임시 폴더에 저장한 뒤 파일 경로로 삽입 (메모리에는 학생별 payload 만 유지)
+    # (원본 시트는 값만 복사되며 열 너비, 셀 서식 등은 유지되지 않음)
+    def report(stage):
+        if progress is None:
+            return None
+        return lambda done, total=0: progress(stage, done, total)
+
+    wb = openpyxl.Workbook(write_only=True)
+    row_counts = [ws.max_row for ws in source.worksheets]
+    on_rows = _row_counter(progress, STAGE_COPY, 0 if None in row_counts else sum(row_counts)) # 행 수를 모르면 0
+    for ws in source.worksheets:
+        target = wb.create_sheet(title=ws.title)
+        if ws.title == ATTENDANCE_SHEET:
+            attendance_copy = target # 아래에서 과목 시트와 함께 기록
+        else:
+            copy_sheet(ws, target, on_rows)
+    qr_sheet = wb.create_sheet(title=QR_SHEET)
+    write_header(qr_sheet, STUDENT_COLUMNS + [QR_COLUMN])
+
+    rows = copy_rows(source[ATTENDANCE_SHEET].iter_rows(values_only=True), attendance_copy, on_rows)
+    header = list(next(rows, ()))
+    index = {column: i for i, column in enumerate(header)}
+    class_index = index[CLASS_COLUMN]
+    student_index = [index[column] for column in STUDENT_COLUMNS]
+    id_position = STUDENT_COLUMNS.index(STUDENT_ID_COLUMN)
+    teacher_position = STUDENT_COLUMNS.index(TEACHER_COLUMN)
+    keep = [i for i, column in enumerate(header) if column not in DROP_COLUMNS] # 과목 시트 열 (class_sheets 와 같음)
+    class_columns = [header[i] for i in keep]
+    if ATTEND_TIME_COLUMN in class_columns:
+        attend_index = class_columns.index(ATTEND_TIME_COLUMN)
+    else:
+        attend_index = len(class_columns)
+        class_columns.append(ATTEND_TIME_COLUMN)
+
+    class_worksheets = {}
+    seen_ids = set()
+    tasks = []
+    student_ids = []
+    for row in trim_blank_rows(rows):
+        if len(row) < len(header):
+            row = row + (None,) * (len(header) - len(row))
+        name = row[class_index]
+        if name is not None:
+            worksheet = class_worksheets.get(name)
+            if worksheet is None:
+                # 과목 시트는 처음 나온 순서로 만들고 마지막에 정렬
+                if str(name) in source.sheetnames:
+                    raise ValueError(f"Sheet '{name}' already exists")
+                worksheet = class_worksheets[name] = wb.create_sheet(title=str(name))
+                write_header(worksheet, class_columns)
+            values = [row[i] for i in keep]
+            if attend_index < len(values):
+                values[attend_index] = None
+            else:
+                values.append(None)
+            worksheet.append(values)
+        student = [row[i] for i in student_index]
+        student_id = student[id_position]
+        if student_id not in seen_ids:
+            seen_ids.add(student_id)
+            qr_sheet.append(student + [None])
+            teacher = student[teacher_position]
+            tasks.append((qr_payload(teacher, student_id), teacher))
+            student_ids.append(student_id)
+    del seen_ids
+
+    # 시트 순서: 원본 시트, 과목 시트(정렬), QR 시트
+    order = source.sheetnames + [str(name) for name in sort_class_names(class_worksheets)] + [QR_SHEET]
+    for position, title in enumerate(order):
+        wb.move_sheet(title, position - wb.sheetnames.index(title))
+
+    with tempfile.TemporaryDirectory(prefix="seperate_qr_") as image_dir:
+        add_qr_image_files(qr_sheet, tasks, get_column_letter(len(STUDENT_COLUMNS) + 1), image_dir, report(STAGE_QR), cache, workers)
+        if export_dir:
+            export_qr_images(student_ids, tasks, export_dir, report(STAGE_EXPORT), cache, workers)
+        save_workbook(wb, output_path, _save_report(progress))
+
+
+def seperate_file_path(source_path, folder_path):
+    # 원본파일명_SEPERATE.xlsx
+    return os.path.join(folder_path, f"{os.path.basename(source_path).split('.xlsx')[0]}_SEPERATE.xlsx")
+
+
+def qr_export_dir(seperate_path):
+    # 고해상도 QR 이미지 폴더 (원본파일명_SEPERATE_QR)
+    return os.path.splitext(seperate_path)[0] + "_QR"
@@ -1,38 +1,22 @@
 from PyQt6.QtCore import QMetaObject, QSize, Qt
 from PyQt6.QtGui import QIcon, QPixmap, QFont
-from PyQt6.QtWidgets import QLabel, QPushButton, QHBoxLayout, QWidget, QVBoxLayout, QFileDialog, QStatusBar, QSizePolicy
-import openpyxl.drawing
-import openpyxl.drawing.image
-import qrcode.constants
+from PyQt6.QtWidgets import QLabel, QPushButton, QHBoxLayout, QWidget, QVBoxLayout, QFileDialog, QStatusBar, QSizePolicy, QCheckBox, QProgressBar
 
 from frontend.gui_email_window import ExcelDialog
 from static.styles.styles import application_style, button_style, statusbar_style
 from static.resources.resource_pathes.resource_pathes import save_icon_path, folder_icon_path
-
-import shutil
-import sys
-import os
-import pandas as pd
-import openpyxl
-from io import BytesIO
-import qrcode
-from qrcode.image.styledpil import StyledPilImage
-from qrcode.image.styles.moduledrawers.pil import RoundedModuleDrawer
-import json
-from PIL import Image,ImageDraw, ImageFont
-
-# 리소스 경로를 절대 경로로 반환
-def resource_path(relative_path):
-    try:
-        base_path = sys._MEIPASS # PyInstaller 로 패키징된 경우 사용하는 base_path
-    except AttributeError:
-        base_path = os.path.abspath('.') # 개발 중에서 사용하는 base_path
-    return os.path.join(base_path, relative_path)
-font_path = resource_path("meiryo.ttc")
-try:
-    font = ImageFont.truetype(font_path,35)
-except IOError:
-    font = ImageFont.load_default()
+from core.qr_sheet_create.qr_image_cache import default_cache
+from core.qr_sheet_create.workbook_builder import seperate_file_path, qr_export_dir, STAGE_COPY, STAGE_ROWS, STAGE_QR, STAGE_EXPORT, STAGE_SAVE
+from core.qr_sheet_create.seperate_job import SeperateJob, SeperateUpdateJob
+
+# SEPERATE 파일 생성 단계별 표시 문구
+STAGE_MESSAGES = {
+    STAGE_COPY: "原本シートコピー中",
+    STAGE_ROWS: "シート作成中",
+    STAGE_QR: "QRコート生成中",
+    STAGE_EXPORT: "高解像度QR画像保存中",
+    STAGE_SAVE: "ファイル保存中",
+}
 
 def _get_icon(icon_path: str) -> QIcon:
     icon: QIcon = QIcon()
@@ -102,12 +86,31 @@ class GuiMainWindow:
         self.save_location_label.setFont(QFont("Arial", 12))
         self.button_layout.addWidget(self.save_location_label)
 
+        # 고해상도 QR 이미지 저장 여부 (엑셀에는 작은 이미지만 삽입)
+        self.hires_checkbox = QCheckBox("高解像度QR画像も保存", self.central_widget)
+        self.hires_checkbox.setFont(QFont("Arial", 12))
+        self.button_layout.addWidget(self.hires_checkbox)
+
         # SEPERATE 파일 생성 버튼 추가
         self.seperate_button = QPushButton("SEPERATE ファイル生成", self.central_widget)
         self.seperate_button.setFont(QFont("Arial", 12))
         self.seperate_button.clicked.connect(self.create_seperate_file)
         self.button_layout.addWidget(self.seperate_button)
 
+        # 기존 SEPERATE 파일 갱신 버튼 (새 명단 반영, 출석 기록 유지)
+        self.update_button = QPushButton("SEPERATE ファイル更新", self.central_widget)
+        self.update_button.setFont(QFont("Arial", 12))
+        self.update_button.clicked.connect(self.update_seperate_file)
+        self.button_layout.addWidget(self.update_button)
+
+        # SEPERATE 파일 생성 취소 버튼 (생성 중에만 활성화)
+        self.cancel_button = QPushButton("キャンセル", self.central_widget)
+        self.cancel_button.setFont(QFont("Arial", 12))
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_seperate_file)
+        self.button_layout.addWidget(self.cancel_button)
+        self.seperate_job = None
+
         # 메일 전송 버튼 추가
         self.send_email_button = QPushButton("send mail", self.central_widget)
         self.send_email_button.clicked.connect(self.open_mail_window)
@@ -127,6 +130,12 @@ class GuiMainWindow:
         self.status_bar = QStatusBar(self.central_widget)
         self.main_layout.addWidget(self.status_bar)
 
+        # 진행률 표시 (생성 중에만 표시)
+        self.progress_bar = QProgressBar(self.status_bar)
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.hide()
+        self.status_bar.addPermanentWidget(self.progress_bar)
+
         # 메인 윈도우에 중앙 위젯 설정
         MainWindow.setCentralWidget(self.central_widget)
 
@@ -174,108 +183,102 @@ class GuiMainWindow:
             self.save_location_label.setText(f"保存場所 : {folder_path}")
 
     def create_seperate_file(self) -> None:
-        # SEPERATE 파일 생성 로직
-        # 1. 원본 파일 복사 -> 
-        #    원본 파일은 변경되지 않도록 복사본을 생성하여 사용
-        self.status_bar.showMessage("原本ファイルコピー中...", 1000)
-        new_file_name = f"{os.path.basename(self.file_path).split('.xlsx')[0]}_SEPERATE.xlsx"
-        new_file_path = os.path.join(self.folder_path, new_file_name)
-        shutil.copy2(self.file_path, new_file_path)
-        self.status_bar.showMessage(f"原本ファイルコピー完了: {new_file_path}", 1000)
-        # 2. "出席調査" 이름의 시트에서 "クラス名"을 기준으로 그룹화
-        self.status_bar.showMessage("科目シート分離中...", 5000)
-
-        xls = pd.ExcelFile(new_file_path)
-
-        if "出席調査" not in xls.sheet_names:
-            self.status_bar.showMessage("出席調査 という名のシートがありません。", 2000)
+        # SEPERATE 파일 생성 로직 (원본 파일은 변경되지 않도록 새 파일로 저장)
+        # 1. 원본 파일을 한 번만 읽음 (원본 시트 유지)
+        # 2. "出席調査" 시트를 "クラス名" 기준으로 그룹화하여 과목별 시트 생성
+        # 3. 학번(学籍番号) 기준으로 중복 제거한 학생 정보(担当教員名, 学年, 学籍番号, 氏名, カナ, 学生メールアドレス)로 QR 시트와 QR 코드 생성
+        # 4. 새 파일에 한 번만 저장
+        # 작업은 백그라운드 스레드(SeperateJob)에서 실행되고 진행 상황은 시그널로 받음
+        if self.seperate_job is not None and self.seperate_job.isRunning():
             return
-        
-        df = pd.read_excel(new_file_path, sheet_name="出席調査")
-        # 2-1. "クラス名"을 기준으로 그룹화
-        grouped = df.groupby("クラス名")
-        with pd.ExcelWriter(new_file_path, engine="openpyxl", mode='a') as writer:
-            for name, group in grouped:
-                # 2-2. 각 시트를 16개 칸으로 구분하여 저장(기존에서 마지막 열만 삭제하면 p(16)까지 있음)
-                group.drop("@std.nagaokauniv.ac.jp", axis=1, inplace=True)
-                group['出席時間']= pd.NA # 출석시간이라는 열을 추가하고 NA로 채움
-                group.to_excel(writer, sheet_name=name, index=False)
-        self.status_bar.showMessage(f"科目別シート分離完了: {new_file_path}", 1000)
-        # 3. 제공받은 원본에서 당담교수명, 학년, 학번, 이름, 이메일주소(担当教員名, 学年,学籍番号,氏名カナ)를 추출하고 중복 필드(학번기준(学籍番号))를 제거한 내용을 QR시트를추가하고 QR를 자동생성한다.
-        # 3. 전체 시트에서 중복되지 않은 학생 정보를 기반으로 QR코드 생성성\
-        self.status_bar.showMessage("QRコート生成中...", 5000)
-        df_students = df[["担当教員名", "学年", "学籍番号", "氏名","カナ","学生メールアドレス"]].drop_duplicates(subset="学籍番号")
-        
-        # pandas로 엑셀 파일에 학생 정보를 먼저 저장
-        with pd.ExcelWriter(new_file_path, engine="openpyxl", mode='a') as writer:
-            df_students['QR']=pd.NA
-            df_students.to_excel(writer, sheet_name="QR", index=False)
-        self.status_bar.showMessage(f"QRコートシート生成完了: {new_file_path}", 1000)
-
-        # openpyxl로 엑셀 파일 열기 (이미지 삽입을 위해)
-        wb = openpyxl.load_workbook(new_file_path)
-        qr_sheet = wb["QR"]
-
-        # QR 코드 이미지를 엑셀 셀에 삽입
-        row_num = 2  # 데이터는 첫 번째 행에 헤더가 있으므로 두 번째 행부터 시작
-        teacher_name_image = None
-        for index, row in df_students.iterrows():
-            qr_code_data = {
-                "担当教員名": row["担当教員名"], # 담당교수명
-                # "学年": row["学年"], # 학생
-                "学籍番号": row["学籍番号"], # 학번
-                # "氏名": row["氏名"],  # 이름
-                # "カナ": row["カナ"],  # 이름 (カナ)
-                # "学生メールアドレス": row["学生メールアドレス"] # 학생 이메일
-            }
-            if teacher_name_image == None:
-                teacher_name_image = self.create_text_to_image(qr_code_data["担当教員名"])
-                teacher_name_image = teacher_name_image.convert("RGBA")
-            # 직렬화(문자열로 변환)
-            qr_code = json.dumps(qr_code_data)
-            
-            # qr 코드 생성
-            qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_L)
-            qr.add_data(qr_code)
-            qr_image = qr.make_image(image_factory=StyledPilImage, module_drawer = RoundedModuleDrawer())
-            # QR 코드의 중앙에 텍스트 이미지 삽입
-            qr_image = qr_image.convert("RGBA")
-
-            qr_image.paste(teacher_name_image, ((qr_image.size[0] - teacher_name_image.size[0]) // 2, (qr_image.size[1] - teacher_name_image.size[1]) // 2), teacher_name_image)
-
-            # qr = qrcode.make(data=qr_code, box_size=9, border=4, version=1,error_correction=qrcode.constants.ERROR_CORRECT_L)
-
-            # QR 코드를 이미지로 변환하여 BytesIO로 저장
-            img_byte_arr = BytesIO()
-            qr_image.save(img_byte_arr, "PNG")
-            img_byte_arr.seek(0)
-
-            # QR 이미지를 openpyxl Image 객체로 변환
-            img = openpyxl.drawing.image.Image(img_byte_arr)
-            # 이미지 크기 조정 (옵션, 필요시 크기를 조정)
-            img.width = 50
-            img.height = 50
-
-            # 엑셀 셀에 이미지 삽입
-            qr_sheet.add_image(img, f"G{row_num}")  # F열에 QR 코드 삽입
-            row_num += 1
-        wb.save(new_file_path)
-        self.status_bar.showMessage(f"全作業完了: {new_file_path}")
+        new_file_path = seperate_file_path(self.file_path, self.folder_path)
+        export_dir = qr_export_dir(new_file_path) if self.hires_checkbox.isChecked() else None
+        self.start_seperate_job(SeperateJob(self.file_path, new_file_path, cache=default_cache(), export_dir=export_dir))
         # 3.2 이메일로 교수한테 전송 -> 이메일과 패스워드를 받기
           # 버튼 눌러 gui_email_window 창 띄우기
         # 4 수업별 QR 코드 체크기능은 이전에 구현된 코드를 사용. -> qr_reader
-        pass
 
-    def create_text_to_image(self,info):
-        # getbbox()를 사용하여 텍스트의 크기를 계산합니다.
-        bbox = font.getbbox(info)  # 텍스트 경계 상자의 크기
-        width, height = bbox[2] - bbox[0], bbox[3] - bbox[1]  # (좌, 상, 우, 하)의 차이를 이용해 너비와 높이 계산
+    def update_seperate_file(self) -> None:
+        # 학기 중 명단 변경 - 선택한 엑셀 파일(새 명단)로 기존 SEPERATE 파일 갱신
+        # 새 학생 추가, 빠진 학생 삭제, 새 학생만 QR 생성 (기존 出席時間/授業回数 유지)
+        if self.seperate_job is not None and self.seperate_job.isRunning():
+            return
+        if not getattr(self, "file_path", None):
+            self.status_bar.showMessage("エクセルファイルを選択してください。", 2000)
+            return
+        seperate_path, _ = QFileDialog.getOpenFileName(
+            None,
+            "更新する SEPERATE ファイル選択",
+            getattr(self, "folder_path", "") or "",
+            "Excel Files (*.xlsx)"
+        )
+        if not seperate_path:
+            return
+        export_dir = qr_export_dir(seperate_path) if self.hires_checkbox.isChecked() else None
+        self.start_seperate_job(SeperateUpdateJob(self.file_path, seperate_path, cache=default_cache(), export_dir=export_dir))
+
+    def start_seperate_job(self, job) -> None:
+        self.seperate_job = job
+        self.seperate_job.progressChanged.connect(self.show_seperate_progress)
+        self.seperate_job.succeeded.connect(self.on_seperate_succeeded)
+        self.seperate_job.failed.connect(self.on_seperate_failed)
+        self.seperate_job.cancelled.connect(self.on_seperate_cancelled)
+        self.seperate_job.finished.connect(self.on_seperate_finished)
+        self.seperate_button.setEnabled(False)
+        self.update_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.show()
+        self.status_bar.showMessage("SEPERATE ファイル生成中...")
+        self.seperate_job.start()
+
+    def cancel_seperate_file(self) -> None:
+        if self.seperate_job is not None and self.seperate_job.isRunning():
+            self.seperate_job.cancel()
+            self.cancel_button.setEnabled(False)
+            self.status_bar.showMessage("キャンセル中...")
+
+    def stop_seperate_job(self) -> None:
+        # 창을 닫을 때 실행 중인 작업을 취소하고 끝날 때까지 대기
+        if self.seperate_job is not None and self.seperate_job.isRunning():
+            self.seperate_job.cancel()
+            self.seperate_job.wait()
+
+    def show_seperate_progress(self, stage, done, total, eta):
+        # 단계별 진행 상황과 남은 시간 표시 (저장 단계는 기록한 크기 표시)
+        if stage == STAGE_SAVE:
+            self.progress_bar.setRange(0, 0)
+            message = f"{STAGE_MESSAGES[stage]}... {done / 1024 / 1024:.1f}MB"
+        elif total <= 0:
+            # 전체 수를 모르는 경우
+            self.progress_bar.setRange(0, 0)
+            message = f"{STAGE_MESSAGES.get(stage, stage)}... {done}"
+        else:
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setValue(done)
+            message = f"{STAGE_MESSAGES.get(stage, stage)}... {done}/{total}"
+        if eta >= 0:
+            message += f" (残り約{int(eta) + 1}秒)"
+        self.status_bar.showMessage(message)
+
+    def on_seperate_succeeded(self, new_file_path, summary) -> None:
+        if summary:
+            # 갱신 결과 (추가/삭제된 학생 수, 새로 생성한 QR 수)
+            message = f"更新完了: 追加 {summary['added']}名, 削除 {summary['removed']}名, QR生成 {summary['rendered']}件"
+            if summary["dropped_classes"]:
+                message += f" (名簿にないクラス: {', '.join(summary['dropped_classes'])})"
+            self.status_bar.showMessage(message)
+            return
+        self.status_bar.showMessage(f"全作業完了: {new_file_path}")
 
-        # 텍스트를 담을 이미지를 생성합니다.
-        img = Image.new("RGB", (width + 20, height + 10), color="white")
-        draw = ImageDraw.Draw(img)
+    def on_seperate_failed(self, message) -> None:
+        self.status_bar.showMessage(f"SEPERATE ファイル生成失敗: {message}", 5000)
 
-        # 텍스트를 이미지에 그립니다.
-        draw.text((10, 0), info, font=font, fill="black")
-        
-        return img
\ No newline at end of file
+    def on_seperate_cancelled(self) -> None:
+        self.status_bar.showMessage("SEPERATE ファイル生成をキャンセルしました。", 5000)
+
+    def on_seperate_finished(self) -> None:
+        self.progress_bar.hide()
+        self.seperate_button.setEnabled(True)
+        self.update_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
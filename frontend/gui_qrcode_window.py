@@ -15,13 +15,15 @@ from PyQt6.QtWidgets import (
     QMessageBox,
 )
 from PyQt6.QtGui import QIcon
-from PyQt6.QtCore import QAbstractTableModel, Qt
+from PyQt6.QtCore import QAbstractTableModel, Qt, QTimer
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 from openpyxl import load_workbook
 
 from core.qr_reader.qrReaderWidget import CameraViewer
+from core.qr_reader.scan_journal import ScanJournal, compact_journal
+from core.qr_reader.camera_service import shutdown_cameras
 
 # 설정 파일 경로
 SETTINGS_FILE = "settings.json"
@@ -46,6 +48,18 @@ class PandasTableModel(QAbstractTableModel):
                 return ""
             return str(value)
         return None
+    def update_row(self, row, changes):
+        # 한 행의 일부 셀만 갱신하고 해당 셀에 대해서만 dataChanged 시그널 발생
+        for column_name, value in changes.items():
+            if column_name not in self._dataframe.columns:
+                continue
+            column = self._dataframe.columns.get_loc(column_name)
+            if self._dataframe.dtypes.iloc[column] != object:
+                # 빈 열은 float 로 읽히므로 문자열(출석 시간)을 넣을 수 있도록 object 로 변환
+                self._dataframe[column_name] = self._dataframe[column_name].astype(object)
+            self._dataframe.iat[row, column] = value
+            index = self.index(row, column)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
     # QAbstractTableModel의 메서드를 오버라이드
     def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
         if role == Qt.ItemDataRole.DisplayRole:
@@ -111,6 +125,10 @@ class MainWindow(QMainWindow):
         self.df = None
         self.sheet_names = []
         self.current_sheet= None
+        self.qr_reader_window = None
+
+        # 카메라 장치를 백그라운드에서 미리 열어둠 (QR 리더 창을 열 때 바로 화면 표시)
+        QTimer.singleShot(0, CameraViewer.prewarm)
 
         # 저장된 설정 로드 ( 마지막 선택한 엑셀 파일경로, 시트명 )
         # self.load_settings()
@@ -125,18 +143,27 @@ class MainWindow(QMainWindow):
             )
             event.ignore()  # Ignore the close event if dialog is still open
         else:
+            shutdown_cameras() # 열어둔 카메라 장치 해제
             event.accept()  # Allow closing if dialog is not open
 
     def qr_window(self):
         # QR 읽기 화면(창)을 띄움. -> qrReaderWidget.py에 정의됨.
         self.qr_reader_window = CameraViewer(self)
         self.qr_reader_window.qrProcessed.connect(self.handle_qr_processed)
+        self.qr_reader_window.attendanceChanged.connect(self.handle_attendance_changed)
         self.qr_reader_window.show()
         # pass
 
     def handle_qr_processed(self):
-        # QR 코드가 읽힐때마다 시트를 새로고침
+        # QR 리더 창을 닫으며 엑셀에 저장된 후 시트를 새로고침
         self.load_sheet_data()
+
+    def handle_attendance_changed(self, sheet_name, row, changes):
+        # QR 코드가 읽힐때마다 바뀐 셀만 테이블에 반영 (엑셀 파일을 다시 읽지 않음)
+        model = self.table_view.model()
+        if sheet_name != self.current_sheet or not isinstance(model, PandasTableModel):
+            return
+        model.update_row(row, changes)
         
     def qr_generate_start(self):
         # QR 코드 생성시작
@@ -181,6 +208,13 @@ class MainWindow(QMainWindow):
     def load_sheet_names(self):
         # 엑셀 파일에서 시트 목록을 불러옴 
         if self.file_path:
+            # 이전 실행에서 엑셀에 반영되지 못한 출석 기록(저널)이 있으면 먼저 반영
+            journal = ScanJournal(self.file_path)
+            if journal.has_entries():
+                try:
+                    compact_journal(self.file_path, journal)
+                except Exception as e:
+                    print(f"Error replaying scan journal: {e}")
             try:
                 excel_file = pd.ExcelFile(self.file_path)
                 self.sheet_names = excel_file.sheet_names